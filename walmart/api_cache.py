@@ -9,6 +9,23 @@ from typing import Any, Dict, Optional, Tuple
 from threading import Lock
 from collections import OrderedDict
 
+# orjson builds the sorted-key request fingerprint in C; stdlib json is the fallback
+try:
+	import orjson
+	ORJSON_AVAILABLE = True
+except ImportError:
+	ORJSON_AVAILABLE = False
+
+
+def _request_key(endpoint: str, params: Dict[str, Any]) -> str:
+	"""md5 of endpoint plus params with sorted keys, so equal requests share a key"""
+	if ORJSON_AVAILABLE:
+		try:
+			return hashlib.md5(endpoint.encode() + b":" + orjson.dumps(params, option=orjson.OPT_SORT_KEYS)).hexdigest()
+		except TypeError:
+			pass
+	return hashlib.md5(f"{endpoint}:{json.dumps(params, sort_keys=True)}".encode()).hexdigest()
+
 
 class InMemoryCache:
 	"""Thread-safe in-memory cache with LRU eviction"""
@@ -34,9 +51,7 @@ class InMemoryCache:
 	
 	def _generate_key(self, endpoint: str, params: Dict[str, Any]) -> str:
 		"""Generate cache key from endpoint and params"""
-		# Sort params for consistent keys
-		key_data = f"{endpoint}:{json.dumps(params, sort_keys=True)}"
-		return hashlib.md5(key_data.encode()).hexdigest()
+		return _request_key(endpoint, params)
 	
 	def get(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
 		"""Get cached response"""
@@ -117,8 +132,7 @@ class RequestDeduplicator:
 	
 	def _generate_key(self, endpoint: str, params: Dict[str, Any]) -> str:
 		"""Generate request key"""
-		key_data = f"{endpoint}:{json.dumps(params, sort_keys=True)}"
-		return hashlib.md5(key_data.encode()).hexdigest()
+		return _request_key(endpoint, params)
 	
 	def should_skip(self, endpoint: str, params: Dict[str, Any]) -> bool:
 		"""
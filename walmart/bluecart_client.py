@@ -1,11 +1,21 @@
 import random
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from config import get_config
 
+# orjson decodes response bodies in C; fall back to requests' stdlib json decoding when it is not installed
+try:
+	import orjson
+	ORJSON_AVAILABLE = True
+except ImportError:
+	ORJSON_AVAILABLE = False
+
 # Phase 3: Import performance optimization modules
 try:
 	from api_cache import InMemoryCache, RequestDeduplicator, RateLimitMonitor
@@ -14,8 +24,27 @@ except ImportError:
 	PERFORMANCE_OPTIMIZATION_AVAILABLE = False
 
 
+def _decode(response: requests.Response) -> Any:
+	"""Parse a response body as JSON; raises ValueError when it is not JSON."""
+	if ORJSON_AVAILABLE:
+		try:
+			return orjson.loads(response.content)
+		except orjson.JSONDecodeError:
+			# e.g. NaN literals or a non-UTF-8 body - let requests' decoder have a go
+			pass
+	return response.json()
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+	"""Seconds from a Retry-After header given as a number; None when absent or an HTTP date."""
+	try:
+		return max(0.0, float(response.headers.get("Retry-After", "")))
+	except ValueError:
+		return None
+
+
 class BlueCartClient:
-	def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, source: Optional[str] = None, site: Optional[str] = None, sleep_seconds: float = 0.0, max_retries: int = 4, retry_backoff_seconds: float = 1.75, request_timeout_seconds: float = 300.0, enable_cache: bool = True, enable_deduplication: bool = True, enable_rate_limit: bool = True):
+	def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, source: Optional[str] = None, site: Optional[str] = None, sleep_seconds: float = 0.0, max_retries: int = 4, retry_backoff_seconds: float = 1.75, request_timeout_seconds: float = 300.0, enable_cache: bool = True, enable_deduplication: bool = True, enable_rate_limit: bool = True, max_in_flight: int = 16, cache_max_size: int = 1000, cache_ttl_seconds: int = 3600):
 		cfg = get_config()
 		self.api_key = api_key or cfg.api_key
 		self.base_url = base_url or cfg.base_url
@@ -25,10 +54,22 @@ class BlueCartClient:
 		self.max_retries = max_retries
 		self.retry_backoff_seconds = retry_backoff_seconds
 		self.request_timeout_seconds = request_timeout_seconds
+		# One pooled session shared by every thread using this client (keeps connections alive)
+		self.session = requests.Session()
+		self.session.mount("https://", HTTPAdapter(pool_connections=max_in_flight, pool_maxsize=max_in_flight))
+		# Bounds concurrent HTTP requests across all threads to the pool size, so nested
+		# fan-outs (keywords x Product API calls) queue here instead of opening throwaway connections
+		self._in_flight = threading.BoundedSemaphore(max_in_flight)
+		# Identical requests already on the wire; later callers wait for the first one's result
+		self._pending: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], Future] = {}
+		self._pending_lock = threading.Lock()
+		# After a 429 every thread holds off until this monotonic time, not just the one that got it
+		self._cooldown_until = 0.0
+		self._cooldown_lock = threading.Lock()
 		
 		# Phase 3: Initialize performance optimization
 		if PERFORMANCE_OPTIMIZATION_AVAILABLE:
-			self.cache = InMemoryCache(max_size=1000, default_ttl=3600) if enable_cache else None
+			self.cache = InMemoryCache(max_size=cache_max_size, default_ttl=cache_ttl_seconds) if enable_cache else None
 			self.deduplicator = RequestDeduplicator(dedup_window_seconds=5) if enable_deduplication else None
 			self.rate_limiter = RateLimitMonitor(max_calls_per_minute=60, max_calls_per_hour=1000) if enable_rate_limit else None
 		else:
@@ -57,6 +98,29 @@ class BlueCartClient:
 			if cached:
 				return cached
 		
+		# Coalesce concurrent identical requests (e.g. one product found by two keywords at once)
+		key = (endpoint, tuple(sorted(merged.items())))
+		with self._pending_lock:
+			pending = self._pending.get(key)
+			is_owner = pending is None
+			if is_owner:
+				pending = self._pending[key] = Future()
+		if not is_owner:
+			return pending.result()
+		try:
+			result = self._send(merged, endpoint)
+		except BaseException as e:
+			pending.set_exception(e)
+			raise
+		else:
+			pending.set_result(result)
+			return result
+		finally:
+			with self._pending_lock:
+				del self._pending[key]
+
+	def _send(self, merged: Dict[str, Any], endpoint: str) -> Dict[str, Any]:
+		"""Issue one request with dedup bookkeeping, rate limiting and retries"""
 		# Phase 3: Check for duplicate requests
 		if self.deduplicator:
 			if self.deduplicator.should_skip(endpoint, merged):
@@ -77,27 +141,35 @@ class BlueCartClient:
 		while True:
 			attempt += 1
 			try:
-				response = requests.get(self.base_url, params=merged, timeout=self.request_timeout_seconds)
+				wait = self._cooldown_until - time.monotonic()
+				if wait > 0:
+					time.sleep(wait)
+				with self._in_flight:
+					response = self.session.get(self.base_url, params=merged, timeout=self.request_timeout_seconds)
 				status = response.status_code
 				if status == 429 or status >= 500:
 					if attempt <= self.max_retries:
 						delay = self.retry_backoff_seconds * (2 ** (attempt - 1))
 						delay = delay * (0.75 + random.random() * 0.5)
-						time.sleep(delay)
+						if status == 429:
+							# Rate limited: honour Retry-After and pause the whole client (checked at the loop top)
+							self._hold_off(_retry_after(response) or delay)
+						else:
+							time.sleep(delay)
 						continue
 					response.raise_for_status()
 				elif 400 <= status < 500:
 					# On client errors, BlueCart often returns a JSON body with request_info/message.
 					# Try to return that JSON so callers can handle gracefully.
 					try:
-						data = response.json()
+						data = _decode(response)
 						return data
 					except ValueError:
 						response.raise_for_status()
 				# success
 				if self.sleep_seconds:
 					time.sleep(self.sleep_seconds)
-				result = response.json()
+				result = _decode(response)
 				
 				# Phase 3: Cache successful response
 				if self.cache:
@@ -112,6 +184,13 @@ class BlueCartClient:
 					continue
 				raise
 
+	def _hold_off(self, seconds: float) -> None:
+		"""Delay every request on this client for at least the given number of seconds."""
+		until = time.monotonic() + seconds
+		with self._cooldown_lock:
+			if until > self._cooldown_until:
+				self._cooldown_until = until
+
 	def search(self, query: str, page: int = 1, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
 		# BlueCart standard: type=search
 		payload: Dict[str, Any] = {
@@ -132,6 +211,22 @@ class BlueCartClient:
 			"item_id": product_id,
 		}, endpoint="product")
 
+	def product_batch(self, product_ids: List[str], max_workers: int = 16) -> Dict[str, Any]:
+		"""Fetch several products concurrently over the pooled session.
+
+		BlueCart's product request takes a single item_id, so a batch is a fan-out rather than
+		one multi-id call. Maps each id to its response, or to the exception its call raised.
+		"""
+		def fetch(product_id: str) -> Any:
+			try:
+				return self.product(product_id)
+			except Exception as e:
+				return e
+		if not product_ids:
+			return {}
+		with ThreadPoolExecutor(max_workers=min(max_workers, len(product_ids))) as ex:
+			return dict(zip(product_ids, ex.map(fetch, product_ids)))
+
 	def offers(self, product_id: str, page: int = 1) -> Dict[str, Any]:
 		# BlueCart standard: type=offers (if supported for site)
 		return self._request({
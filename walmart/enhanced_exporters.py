@@ -6,11 +6,12 @@ import csv
 import json
 import os
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import pandas as pd
 
 from config import get_config
+from exporters import write_json_array
 
 
 def _timestamp() -> str:
@@ -268,7 +269,9 @@ class EnhancedCSVExporter:
         # Try to extract image_url from product_images if available
         if not transformed.get("image_url") and record.get("product_images"):
             images = record["product_images"]
-            if isinstance(images, str) and images:
+            if isinstance(images, list):
+                transformed["image_url"] = images[0].strip()
+            elif isinstance(images, str) and images:
                 # Take the first image URL
                 first_image = images.split("|")[0] if "|" in images else images
                 transformed["image_url"] = first_image.strip()
@@ -421,18 +424,12 @@ class EnhancedCSVExporter:
         except (ValueError, TypeError):
             return str(value)
 
-    def export_csv(self, records: List[Dict[str, Any]], name_prefix: str,
+    def export_csv(self, records: Iterable[Dict[str, Any]], name_prefix: str,
                    include_metadata: bool = True, domain: str = "Walmart") -> str:
-        """Export records to CSV with required integration format"""
+        """Export records to CSV with required integration format (rows are streamed)"""
         if not records:
             return self._create_empty_csv(name_prefix)
         
-        # Transform records to required format
-        transformed_records = []
-        for record in records:
-            transformed_record = self._transform_record_to_required_format(record, domain)
-            transformed_records.append(transformed_record)
-        
         # Use required column order
         final_columns = self.column_order
         headers = [HEADER_LOOKUP.get(field, field) for field in final_columns]
@@ -441,11 +438,13 @@ class EnhancedCSVExporter:
         output_dir = ensure_output_dir()
         path = os.path.join(output_dir, f"{name_prefix}_{_timestamp()}.csv")
         
-        with open(path, "w", newline="", encoding="utf-8") as f:
+        with open(path, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
             writer = csv.writer(f)
             writer.writerow(headers)
 
-            for record in transformed_records:
+            for source in records:
+                # Transform records to required format
+                record = self._transform_record_to_required_format(source, domain)
                 row: List[Any] = []
                 for field in final_columns:
                     if field == "price":
@@ -574,7 +573,7 @@ class ExcelExporter:
         return path
 
 # Convenience functions for backward compatibility
-def export_csv_enhanced(records: List[Dict[str, Any]], name_prefix: str, 
+def export_csv_enhanced(records: Iterable[Dict[str, Any]], name_prefix: str, 
                        custom_fields: Optional[List[str]] = None,
                        include_metadata: bool = True, domain: str = "Walmart") -> str:
     """Enhanced CSV export with required integration format"""
@@ -604,7 +603,7 @@ def get_export_preset(preset_name: str) -> Optional[List[str]]:
     """Get predefined field selection"""
     return EXPORT_PRESETS.get(preset_name)
 
-def export_json_enhanced(records: List[Dict[str, Any]], name_prefix: str, 
+def export_json_enhanced(records: Iterable[Dict[str, Any]], name_prefix: str, 
                         domain: str = "Walmart") -> str:
     """Export records to JSON with required integration format"""
     if not records:
@@ -614,20 +613,14 @@ def export_json_enhanced(records: List[Dict[str, Any]], name_prefix: str,
             json.dump({"message": "No records found"}, f, indent=2)
         return path
     
-    # Transform records to required format
-    transformed_records = []
-    for record in records:
-        # Create a temporary exporter to use the transformation function
-        exporter = EnhancedCSVExporter()
-        transformed_record = exporter._transform_record_to_required_format(record, domain)
-        transformed_records.append(transformed_record)
-    
     # Create JSON file
     output_dir = ensure_output_dir()
     path = os.path.join(output_dir, f"{name_prefix}_{_timestamp()}.json")
     
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(transformed_records, f, indent=2, ensure_ascii=False)
+    # Transform records to required format while streaming them out
+    exporter = EnhancedCSVExporter()
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        write_json_array(f, (exporter._transform_record_to_required_format(record, domain) for record in records))
     
     return path
 
@@ -1,32 +1,100 @@
 import csv
 import json
 import os
+import tempfile
+import threading
+import time
 from datetime import datetime
-from typing import Any, Dict, Iterable, List
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
 
 from config import get_config
 
+# orjson (C serializer) is used for exports, spools and debug output when installed; stdlib json otherwise
+try:
+	import orjson
+	ORJSON_AVAILABLE = True
+except ImportError:
+	ORJSON_AVAILABLE = False
+
+
+# Exports stream rows to disk; a large buffer keeps write syscalls infrequent
+_WRITE_BUFFER = 1 << 20
+
 
 def _timestamp() -> str:
 	return datetime.utcnow().strftime("%Y%m%d_%H%M%S")
 
 
+def _dumps_bytes(obj: Any) -> bytes:
+	if ORJSON_AVAILABLE:
+		try:
+			return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+		except TypeError:
+			pass
+	return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _dumps_indented(obj: Any) -> str:
+	if ORJSON_AVAILABLE:
+		try:
+			return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+		except TypeError:
+			pass
+	return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+def _loads(line: bytes) -> Any:
+	return orjson.loads(line) if ORJSON_AVAILABLE else json.loads(line)
+
+
+# List-valued fields held on records until export, written as one "|"-separated string
+_JOINED_FIELDS = ("product_images",)
+
+
+def _join_fields(record: Dict[str, Any]) -> Dict[str, Any]:
+	if not any(isinstance(record.get(k), list) for k in _JOINED_FIELDS):
+		return record
+	row = dict(record)
+	for k in _JOINED_FIELDS:
+		if isinstance(row.get(k), list):
+			row[k] = "|".join(row[k])
+	return row
+
+
 def ensure_output_dir() -> str:
 	cfg = get_config()
 	os.makedirs(cfg.output_dir, exist_ok=True)
 	return cfg.output_dir
 
 
-def export_json(records: List[Dict[str, Any]], name_prefix: str) -> str:
+def write_json_array(f, items: Iterable[Any]) -> None:
+	"""Stream items as a JSON array laid out like json.dump(list(items), f, ensure_ascii=False, indent=2)."""
+	first = True
+	for item in items:
+		f.write("[\n  " if first else ",\n  ")
+		f.write(_dumps_indented(item).replace("\n", "\n  "))
+		first = False
+	f.write("[]" if first else "\n]")
+
+
+def export_json(records: Iterable[Dict[str, Any]], name_prefix: str) -> str:
 	output_dir = ensure_output_dir()
 	path = os.path.join(output_dir, f"{name_prefix}_{_timestamp()}.json")
-	with open(path, "w", encoding="utf-8") as f:
-		json.dump(records, f, ensure_ascii=False, indent=2)
+	with open(path, "w", encoding="utf-8", buffering=_WRITE_BUFFER) as f:
+		write_json_array(f, (_join_fields(r) for r in records))
 	return path
 
 
-def export_csv(records: List[Dict[str, Any]], name_prefix: str) -> str:
-	if not records:
+def export_csv(records: Iterable[Dict[str, Any]], name_prefix: str, fieldnames: Optional[List[str]] = None) -> str:
+	"""Write records as CSV.
+
+	Without fieldnames, records is read twice (header pass, then rows), so pass
+	a list or a RecordSpool. Callers whose rows share one key set can pass the
+	header directly and skip the extra pass.
+	"""
+	headers = fieldnames if fieldnames is not None else sorted({k for r in records for k in r.keys()})
+	if not headers:
 		output_dir = ensure_output_dir()
 		path = os.path.join(output_dir, f"{name_prefix}_{_timestamp()}.csv")
 		with open(path, "w", newline="", encoding="utf-8") as f:
@@ -34,22 +102,103 @@ def export_csv(records: List[Dict[str, Any]], name_prefix: str) -> str:
 			writer.writerow(["no_records"])
 		return path
 
-	headers = sorted({k for r in records for k in r.keys()})
 	output_dir = ensure_output_dir()
 	path = os.path.join(output_dir, f"{name_prefix}_{_timestamp()}.csv")
-	with open(path, "w", newline="", encoding="utf-8") as f:
-		writer = csv.DictWriter(f, fieldnames=headers, extrasaction="ignore")
-		writer.writeheader()
-		for r in records:
-			writer.writerow(r)
+	with open(path, "w", newline="", encoding="utf-8", buffering=_WRITE_BUFFER) as f:
+		writer = csv.writer(f)
+		writer.writerow(headers)
+		writer.writerows(map(_row_values(headers), records))
 	return path
 
 
-def write_debug_json(obj: Any, filename: str) -> str:
-	output_dir = ensure_output_dir()
-	path = os.path.join(output_dir, filename)
-	with open(path, "w", encoding="utf-8") as f:
-		json.dump(obj, f, ensure_ascii=False, indent=2)
-	return path
+def _row_values(headers: List[str]) -> Callable[[Dict[str, Any]], Iterable[Any]]:
+	"""Record -> CSV values in header order, like DictWriter (missing keys -> "", extra keys ignored).
+
+	Rows with every header key (the usual case) go through one C-level itemgetter call.
+	"""
+	values = itemgetter(*headers)
+	single = len(headers) == 1
+
+	def row(record: Dict[str, Any]) -> Iterable[Any]:
+		record = _join_fields(record)
+		try:
+			picked = values(record)
+		except KeyError:
+			return [record.get(k, "") for k in headers]
+		return (picked,) if single else picked
+
+	return row
+
+
+class DebugStream:
+	"""Append-only JSONL sink for raw API responses captured in debug mode.
+
+	One file is opened per run instead of one file per response. Writes are
+	serialized so keyword scans on several threads can share the stream.
+	"""
+
+	def __init__(self, filename: str = "debug.jsonl"):
+		self.path = os.path.join(ensure_output_dir(), filename)
+		self._fp = open(self.path, "ab", buffering=_WRITE_BUFFER)
+		self._lock = threading.Lock()
+
+	def write(self, name: str, obj: Any) -> None:
+		line = _dumps_bytes({"name": name, "ts": time.time(), "payload": obj}) + b"\n"
+		with self._lock:
+			self._fp.write(line)
+
+	def close(self) -> None:
+		self._fp.close()
+
+
+class RecordSpool:
+	"""Append-only JSONL spool of records in the system temp dir.
+
+	Keeps crawl results on disk instead of in memory, and out of the output dir, so a
+	crashed run doesn't leave spool files next to the exports. Iterating re-reads the file,
+	so one spool can feed several exports; map() gives a transformed view of it.
+	"""
+
+	def __init__(self, prefix: str = "records"):
+		fd, self.path = tempfile.mkstemp(prefix=f"{prefix}_", suffix=".jsonl")
+		os.close(fd)
+		self._fp = open(self.path, "ab", buffering=_WRITE_BUFFER)
+		self._count = 0
+
+	def append(self, record: Dict[str, Any]) -> None:
+		self._fp.write(_dumps_bytes(record) + b"\n")
+		self._count += 1
+
+	def map(self, transform: Callable[[Dict[str, Any]], Dict[str, Any]]) -> "_SpoolView":
+		return _SpoolView(self, transform)
+
+	def __len__(self) -> int:
+		return self._count
+
+	def __iter__(self) -> Iterator[Dict[str, Any]]:
+		self._fp.flush()
+		with open(self.path, "rb", buffering=_WRITE_BUFFER) as f:
+			for line in f:
+				yield _loads(line)
+
+	def close(self) -> None:
+		"""Close and delete the spool file."""
+		if not self._fp.closed:
+			try:
+				self._fp.close()
+			finally:
+				os.remove(self.path)
+
+
+class _SpoolView:
+	"""Re-iterable view applying transform to each spooled record."""
+
+	def __init__(self, spool: RecordSpool, transform: Callable[[Dict[str, Any]], Dict[str, Any]]):
+		self._spool = spool
+		self._transform = transform
 
+	def __len__(self) -> int:
+		return len(self._spool)
 
+	def __iter__(self) -> Iterator[Dict[str, Any]]:
+		return map(self._transform, self._spool)
@@ -1,33 +1,119 @@
 import argparse
+import re
+import sys
+import threading
 import time
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
+from itertools import islice, repeat
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 
 from bluecart_client import BlueCartClient
 from config import get_config
-from storage import init_db, insert_listing_snapshot, insert_seller_snapshot, upsert_listing_summary
-from exporters import export_json, export_csv, write_debug_json
-# Import enhanced exporters for integration format
-try:
-    from enhanced_exporters import export_csv_enhanced, export_json_enhanced
-    ENHANCED_EXPORTS_AVAILABLE = True
-except ImportError:
-    ENHANCED_EXPORTS_AVAILABLE = False
+from storage import SnapshotWriter, init_db
+from exporters import DebugStream, RecordSpool, export_json, export_csv
 # Removed imports for deleted modules - using simplified version
 
+# Enhanced exporters (integration format) pull in pandas, so they are imported
+# lazily on the first export instead of at every script start
+_ENHANCED_EXPORTERS: Any = None
 
-def _safe_get(d: Dict[str, Any], *keys, default=None):
-	cur = d
-	for k in keys:
-		if not isinstance(cur, dict) or k not in cur:
-			return default
-		cur = cur[k]
-	return cur
+
+def _get_enhanced_exporters() -> Optional[Any]:
+	"""Return the enhanced_exporters module, or None if it cannot be imported."""
+	global _ENHANCED_EXPORTERS
+	if _ENHANCED_EXPORTERS is None:
+		try:
+			import enhanced_exporters
+			_ENHANCED_EXPORTERS = enhanced_exporters
+		except ImportError:
+			_ENHANCED_EXPORTERS = False
+	return _ENHANCED_EXPORTERS or None
+
+
+# Keys BlueCart uses for the URL when an image is returned as an object
+_IMG_KEYS = ("url", "link", "src", "image")
+
+
+def _as_dict(node: Any) -> Dict[str, Any]:
+	"""Return node when it is a dict, else an empty dict (lets lookups chain with .get)."""
+	return node if isinstance(node, dict) else {}
+
+
+def _primary_offer_of(node: Dict[str, Any]) -> Dict[str, Any]:
+	"""node["offers"]["primary"] as a dict, or {} when any level is missing."""
+	return _as_dict(_as_dict(node.get("offers")).get("primary"))
+
+
+# BlueCart currency symbols -> ISO codes
+_CURRENCY_CODE = {
+	"$": "USD",
+	"£": "GBP",
+	"€": "EUR",
+	"C$": "CAD",
+}
+
+
+def _coerce_images(images: Any) -> List[str]:
+	"""Coerce BlueCart image entries (plain URLs or url/link/src objects) to URL strings."""
+	# Common case: BlueCart already returned plain URLs, checked at C level
+	if all(map(isinstance, images, repeat(str))):
+		return list(images)
+	# builtins bound locally: this runs for every image of every item
+	_isinstance, _str, _keys = isinstance, str, _IMG_KEYS
+	coerced = [
+		img if _isinstance(img, _str) else next((img[k] for k in _keys if _isinstance(img.get(k), _str)), None)
+		for img in images if _isinstance(img, (_str, dict))
+	]
+	return [img for img in coerced if img is not None]
+
+
+# (epoch second, "HH:MM:SS" UTC) of the last _ts() call; progress lines mostly land in the same second
+_TS_CACHE: Tuple[int, str] = (-1, "")
 
 
 def _ts() -> str:
-	return datetime.utcnow().strftime("%H:%M:%S")
+	global _TS_CACHE
+	now = int(time.time())
+	sec, text = _TS_CACHE
+	if now != sec:
+		text = time.strftime("%H:%M:%S", time.gmtime(now))
+		_TS_CACHE = (now, text)
+	return text
+
+
+def _kw_print(kw: str, msg: str) -> None:
+	"""Print a progress line from a keyword scan thread, tagged with its keyword.
+
+	The line goes out in one write, so lines from concurrent keywords don't run together.
+	"""
+	sys.stdout.write(f"[{_ts()}] [{kw}] {msg}\n")
+	sys.stdout.flush()
+
+
+# Seller names (casefolded) that mean the item is sold by Walmart itself
+_WALMART_NAMES = frozenset(("walmart.com", "walmart", "walmart inc."))
+# Contact details filled in for Walmart-sold items (blank for everyone else until enrichment)
+_WALMART_CONTACT = {
+	"email_address": "help@walmart.com",
+	"business_legal_name": "Walmart Inc.",
+	"phone_number": "1-800-925-6278",
+	"address": "702 SW 8th St, Bentonville, AR 72716, USA",
+}
+_EMPTY_CONTACT = dict.fromkeys(_WALMART_CONTACT, "")
+
+# Address key aliases seen in seller_profile payloads, in priority order
+_ADDR1 = ("address1", "street1", "streetAddress")
+_ADDR_CITY = ("city", "addressLocality")
+_ADDR_ST = ("state", "addressRegion")
+_ADDR_ZIP = ("category_id", "postalCode", "zip")
+_ADDR_CC = ("country", "addressCountry")
+
+
+def _first(d: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+	"""Return the first truthy value of d under keys, or None."""
+	return next((d[k] for k in keys if d.get(k)), None)
 
 
 def _extract_seller_fields(sp: Dict[str, Any]) -> Dict[str, Any]:
@@ -46,17 +132,12 @@ def _extract_seller_fields(sp: Dict[str, Any]) -> Dict[str, Any]:
 	state_province = None
 	zip_code = None
 	if addr_obj:
-		parts = [
-			addr_obj.get("address1") or addr_obj.get("street1") or addr_obj.get("streetAddress"),
-			addr_obj.get("city") or addr_obj.get("addressLocality"),
-			addr_obj.get("state") or addr_obj.get("addressRegion"),
-			addr_obj.get("category_id") or addr_obj.get("postalCode") or addr_obj.get("zip"),
-			addr_obj.get("country") or addr_obj.get("addressCountry"),
-		]
-		address_text = address_text or " ".join([p for p in parts if p])
-		country = (addr_obj.get("country") or addr_obj.get("addressCountry")) if not isinstance(addr_obj.get("addressCountry"), dict) else None
-		state_province = addr_obj.get("state") or addr_obj.get("addressRegion")
-		zip_code = addr_obj.get("category_id") or addr_obj.get("postalCode") or addr_obj.get("zip")
+		state_province = _first(addr_obj, _ADDR_ST)
+		zip_code = _first(addr_obj, _ADDR_ZIP)
+		country_any = _first(addr_obj, _ADDR_CC)
+		parts = (_first(addr_obj, _ADDR1), _first(addr_obj, _ADDR_CITY), state_province, zip_code, country_any)
+		address_text = address_text or " ".join(filter(None, parts))
+		country = country_any if not isinstance(addr_obj.get("addressCountry"), dict) else None
 	# Reviews total
 	rating_breakdown = node.get("rating_breakdown") if isinstance(node.get("rating_breakdown"), dict) else None
 	total_reviews_calc = sum(int(v) for v in rating_breakdown.values()) if rating_breakdown else None
@@ -75,41 +156,117 @@ def _extract_seller_fields(sp: Dict[str, Any]) -> Dict[str, Any]:
 	}
 
 
-def _is_numeric_string(value: Optional[str]) -> bool:
-	try:
-		return value is not None and str(int(str(value))) == str(value)
-	except Exception:
+def _is_numeric_string(value: Any) -> bool:
+	"""True for canonical integer strings ("123", "-7"; not "007", "1.0" or "1_000"), without an int() round-trip.
+
+	Non-str values are judged by their str() form; plain ints always pass, so callers pass ids as-is.
+	"""
+	if value is None:
 		return False
+	if type(value) is int:
+		return True
+	s = value if isinstance(value, str) else str(value)
+	digits = s[1:] if s.startswith("-") else s
+	return digits.isascii() and digits.isdigit() and (digits[0] != "0" or s == "0")
+
+
+# Path segment after the first "/seller/" of a seller URL, up to the next "/" or "?"
+_SELLER_PATH_RE = re.compile(r"/seller/([^/?]*)")
+
+
+def _seller_id_from_url(seller_url: str) -> Optional[str]:
+	"""The (stripped) segment after /seller/ in a seller URL, or None when there is none."""
+	m = _SELLER_PATH_RE.search(seller_url)
+	return m.group(1).strip() if m else None
 
 
 def _collect_numeric_seller_id(node: Any) -> Optional[str]:
-	"""Walk arbitrary dict/list to find a numeric seller id if present."""
-	try:
-		if isinstance(node, dict):
+	"""Walk arbitrary dict/list to find a numeric seller id if present.
+
+	Iterative depth-first walk in key order, so the first id found matches a recursive walk.
+	"""
+	stack = [node]
+	while stack:
+		cur = stack.pop()
+		if isinstance(cur, dict):
 			# direct fields
 			for key in ("seller_id", "sellerId", "id"):
-				val = node.get(key)
-				if isinstance(val, (str, int)) and _is_numeric_string(str(val)):
+				val = cur.get(key)
+				if isinstance(val, (str, int)) and _is_numeric_string(val):
 					return str(val)
 			# nested seller object
-			sel = node.get("seller")
+			sel = cur.get("seller")
 			if isinstance(sel, dict):
 				val = sel.get("id")
-				if isinstance(val, (str, int)) and _is_numeric_string(str(val)):
+				if isinstance(val, (str, int)) and _is_numeric_string(val):
 					return str(val)
-			# recurse
-			for v in node.values():
-				found = _collect_numeric_seller_id(v)
-				if found:
-					return found
-		elif isinstance(node, list):
-			for it in node:
-				found = _collect_numeric_seller_id(it)
-				if found:
-					return found
-		return None
-	except Exception:
-		return None
+			stack.extend(v for v in reversed(cur.values()) if isinstance(v, (dict, list)))
+		elif isinstance(cur, list):
+			stack.extend(v for v in reversed(cur) if isinstance(v, (dict, list)))
+	return None
+
+
+def _extract_seller(raw: Dict[str, Any], primary_offer: Dict[str, Any], primary_o: Dict[str, Any], product_resp: Optional[Dict[str, Any]]) -> Tuple[Optional[str], Any]:
+	"""Resolve (seller_url, seller_id) for a search item in one pass.
+
+	Product API data wins (product.buybox_winner.seller, NOT offers.primary.seller),
+	then the search offer; a numeric id in a /seller/{id} URL overrides the id.
+	"""
+	product_resp = _as_dict(product_resp)
+	if product_resp:
+		product_buybox = _as_dict(_as_dict(product_resp.get("product")).get("buybox_winner"))
+		product_offer = _primary_offer_of(product_resp) or product_buybox
+		product_offer_seller = _as_dict(product_offer.get("seller"))
+		product_seller = _as_dict(product_buybox.get("seller") or product_offer_seller)
+		product_url = product_seller.get("link") or product_offer_seller.get("link")
+		product_id = product_seller.get("id") or product_offer_seller.get("id")
+	else:
+		# No Product API call was made (the common, cost-saving case): search data only
+		product_url = product_id = None
+	# primary_o already folds in primary_offer's seller_url / seller.url and seller_id / seller.id
+	seller_url = product_url or primary_o.get("url") or primary_offer.get("url")
+	seller_id = (
+		product_id or
+		primary_o.get("seller_id") or
+		_collect_numeric_seller_id(raw) or
+		(_collect_numeric_seller_id(product_resp) if product_resp else None)
+	)
+	# Pattern: https://www.walmart.com/seller/{numeric_id}
+	if isinstance(seller_url, str):
+		potential_id = _seller_id_from_url(seller_url)
+		if potential_id and _is_numeric_string(potential_id):
+			seller_id = potential_id
+	# No URL anywhere: build it from a numeric id (seller enrichment may still improve it later)
+	if not seller_url and seller_id and _is_numeric_string(seller_id):
+		seller_url = f"https://www.walmart.com/seller/{seller_id}"
+	return seller_url, seller_id
+
+
+# Known false positives per brand: (brand_key, exclude_if_contains, require_contains)
+_FALSE_POSITIVE_RULES = (
+	("triple paste", ("colgate", "crest", "mutti", "triple action", "toothpaste", "dental"), ("paste", "diaper", "rash", "ointment", "cream")),
+	("amlactin", ("lactic", "acid", "moisturizer"), ("amlactin",)),
+	("kerasal", (), ("kerasal",)),
+	("dermoplast", (), ("dermoplast",)),
+	("new-skin", (), ("new-skin", "new skin")),
+	("domeboro", (), ("domeboro",)),
+)
+
+
+@lru_cache(maxsize=256)
+def _keyword_profile(keyword: str) -> Tuple[Tuple[str, ...], Tuple[Tuple[Tuple[str, ...], Tuple[str, ...]], ...]]:
+	"""(words a match must contain, applicable false-positive rules) for a search keyword, derived once per keyword"""
+	keyword_lower = keyword.lower().strip()
+	# Extract brand name from keyword (e.g., "Triple Paste" -> ["triple", "paste"])
+	# For single-word brands, use the whole word
+	keyword_words = keyword_lower.split()
+	if len(keyword_words) == 1:
+		words = (keyword_lower,)
+	else:
+		# Multi-word brand - filter out common words like "the", "and", "of"
+		words = tuple(w for w in keyword_words if len(w) > 2 and w not in ("the", "and", "of", "for")) or tuple(keyword_words)
+	rules = tuple((exclude, require) for brand_key, exclude, require in _FALSE_POSITIVE_RULES if brand_key in keyword_lower)
+	return words, rules
 
 
 def is_brand_match(keyword: str, product_title: str, product_brand: str, raw_product: Optional[Dict[str, Any]] = None) -> bool:
@@ -129,74 +286,24 @@ def is_brand_match(keyword: str, product_title: str, product_brand: str, raw_pro
 	if not keyword or not product_title:
 		return True  # If no keyword or title, don't filter (let it through)
 	
-	keyword_lower = keyword.lower().strip()
-	title_lower = (product_title or "").lower()
+	words, rules = _keyword_profile(keyword)
+	title_lower = product_title.lower()
 	brand_lower = (product_brand or "").lower()
 	
-	# Extract brand name from keyword (e.g., "Triple Paste" -> ["triple", "paste"])
-	# For single-word brands, use the whole word
-	keyword_words = keyword_lower.split()
-	if len(keyword_words) == 1:
-		# Single word brand - check if it appears as a brand name
-		brand_match = keyword_lower in brand_lower or keyword_lower in title_lower
-		if not brand_match:
-			return False
-	else:
-		# Multi-word brand - check if all significant words appear
-		# Filter out common words like "the", "and", "of"
-		significant_words = [w for w in keyword_words if len(w) > 2 and w not in ["the", "and", "of", "for"]]
-		if not significant_words:
-			significant_words = keyword_words
-		
-		# Check if brand appears in title or brand field
-		brand_in_title = all(word in title_lower for word in significant_words)
-		brand_in_brand_field = all(word in brand_lower for word in significant_words) if brand_lower else False
-		
-		if not brand_in_title and not brand_in_brand_field:
-			return False
-	
-	# Check for common false positives
-	false_positive_map = {
-		"triple paste": {
-			"exclude_if_contains": ["colgate", "crest", "mutti", "triple action", "toothpaste", "dental"],
-			"require_contains": ["paste", "diaper", "rash", "ointment", "cream"]
-		},
-		"amlactin": {
-			"exclude_if_contains": ["lactic", "acid", "moisturizer"],
-			"require_contains": ["amlactin"]
-		},
-		"kerasal": {
-			"exclude_if_contains": [],
-			"require_contains": ["kerasal"]
-		},
-		"dermoplast": {
-			"exclude_if_contains": [],
-			"require_contains": ["dermoplast"]
-		},
-		"new-skin": {
-			"exclude_if_contains": [],
-			"require_contains": ["new-skin", "new skin"]
-		},
-		"domeboro": {
-			"exclude_if_contains": [],
-			"require_contains": ["domeboro"]
-		}
-	}
+	# Check if all brand words appear in the title or in the brand field
+	brand_in_title = all(word in title_lower for word in words)
+	brand_in_brand_field = all(word in brand_lower for word in words) if brand_lower else False
+	if not brand_in_title and not brand_in_brand_field:
+		return False
 	
 	# Check false positive rules
-	for brand_key, rules in false_positive_map.items():
-		if brand_key in keyword_lower:
-			# Check exclusion rules
-			exclude_keywords = rules.get("exclude_if_contains", [])
-			for exclude_kw in exclude_keywords:
-				if exclude_kw in title_lower and not any(req in title_lower for req in rules.get("require_contains", [])):
-					return False
-			
-			# Check requirement rules
-			require_keywords = rules.get("require_contains", [])
-			if require_keywords:
-				if not any(req in title_lower or req in brand_lower for req in require_keywords):
-					return False
+	for exclude_keywords, require_keywords in rules:
+		# Check exclusion rules
+		if any(exclude_kw in title_lower for exclude_kw in exclude_keywords) and not any(req in title_lower for req in require_keywords):
+			return False
+		# Check requirement rules
+		if require_keywords and not any(req in title_lower or req in brand_lower for req in require_keywords):
+			return False
 	
 	return True
 
@@ -259,34 +366,36 @@ def collect_upc_from_multiple_sources(raw_product: Dict[str, Any], product_resp:
 	
 	# Try Product API response first (most reliable)
 	if product_resp:
-		product_data = _safe_get(product_resp, "product", default={}) or product_resp
+		product_data = _as_dict(product_resp.get("product")) or product_resp
+		identifiers = _as_dict(product_data.get("identifiers"))
 		upc = (
 			product_data.get("upc") or
 			product_data.get("gtin") or
 			product_data.get("gtin14") or
 			product_data.get("ean") or
-			_safe_get(product_data, "identifiers", "upc") or
-			_safe_get(product_data, "identifiers", "gtin")
+			identifiers.get("upc") or
+			identifiers.get("gtin")
 		)
 		if upc:
 			return str(upc).strip()
 	
 	# Try raw product from search results
 	if raw_product:
+		identifiers = _as_dict(raw_product.get("identifiers"))
 		upc = (
 			raw_product.get("upc") or
 			raw_product.get("gtin") or
 			raw_product.get("gtin14") or
 			raw_product.get("ean") or
-			_safe_get(raw_product, "identifiers", "upc") or
-			_safe_get(raw_product, "identifiers", "gtin")
+			identifiers.get("upc") or
+			identifiers.get("gtin")
 		)
 		if upc:
 			return str(upc).strip()
 	
 	# Try raw search item
 	if raw_search:
-		product_from_search = _safe_get(raw_search, "product", default={})
+		product_from_search = _as_dict(raw_search.get("product"))
 		if product_from_search:
 			upc = (
 				product_from_search.get("upc") or
@@ -298,7 +407,7 @@ def collect_upc_from_multiple_sources(raw_product: Dict[str, Any], product_resp:
 				return str(upc).strip()
 		
 		# Check variants
-		variants = _safe_get(raw_search, "product", "variants") or _safe_get(raw_search, "variants") or []
+		variants = product_from_search.get("variants") or raw_search.get("variants") or []
 		if variants and isinstance(variants, list):
 			for variant in variants:
 				if isinstance(variant, dict):
@@ -321,9 +430,11 @@ def validate_seller_url(seller_url: Optional[str], seller_id: Optional[str], sel
 	Returns:
 		Tuple of (validated_url, is_valid)
 	"""
+	# Checked once; every branch below keys off the same answer
+	numeric_id = bool(seller_id) and _is_numeric_string(seller_id)
 	if not seller_url:
 		# Construct URL from seller ID if available
-		if seller_id and _is_numeric_string(str(seller_id)):
+		if numeric_id:
 			return f"https://www.walmart.com/seller/{seller_id}", True
 		return None, False
 	
@@ -338,97 +449,70 @@ def validate_seller_url(seller_url: Optional[str], seller_id: Optional[str], sel
 		# Might be a relative URL
 		if seller_url.startswith("/seller/"):
 			seller_url = f"https://www.walmart.com{seller_url}"
-		elif seller_id and _is_numeric_string(str(seller_id)):
+		elif numeric_id:
 			# Construct from seller ID
 			seller_url = f"https://www.walmart.com/seller/{seller_id}"
 		else:
 			return None, False
 	
-	# Extract seller ID from URL to validate
-	if "/seller/" in seller_url:
-		try:
-			url_parts = seller_url.split("/seller/")
-			if len(url_parts) > 1:
-				url_seller_id = url_parts[1].split("/")[0].split("?")[0].strip()
-				# If we have a seller_id, validate it matches URL
-				if seller_id and _is_numeric_string(str(seller_id)):
-					if str(seller_id) != url_seller_id:
-						# Mismatch - reconstruct URL with correct ID
-						return f"https://www.walmart.com/seller/{seller_id}", True
-		except Exception:
-			pass
+	# If we have a numeric seller_id, validate it matches the ID in the URL
+	if numeric_id:
+		url_seller_id = _seller_id_from_url(seller_url)
+		if url_seller_id is not None and str(seller_id) != url_seller_id:
+			# Mismatch - reconstruct URL with correct ID
+			return f"https://www.walmart.com/seller/{seller_id}", True
 	
 	return seller_url, True
 
 
 def normalize_listing_from_search(item: Dict[str, Any]) -> Dict[str, Any]:
-	product = _safe_get(item, "product", default={}) or {}
-	offers = _safe_get(item, "offers", default={}) or {}
-	primary = _safe_get(offers, "primary", default={}) or {}
-	images = _safe_get(product, "images", default=[]) or []
-	# Coerce images to strings if BlueCart returns objects
-	coerced_images: List[str] = []
-	for img in images:
-		if isinstance(img, str):
-			coerced_images.append(img)
-		elif isinstance(img, dict):
-			for key in ("url", "link", "src", "image"):
-				val = img.get(key)
-				if isinstance(val, str):
-					coerced_images.append(val)
-					break
-	main_image = _safe_get(product, "main_image") or (coerced_images[0] if coerced_images else None)
-	currency_symbol = _safe_get(primary, "currency_symbol")
-	currency_code = {
-		"$": "USD",
-		"£": "GBP",
-		"€": "EUR",
-		"C$": "CAD",
-	}.get(currency_symbol or "", None)
+	return _listing_from_nodes(_as_dict(item.get("product")), _primary_offer_of(item))
+
+
+def _listing_from_nodes(product: Dict[str, Any], primary: Dict[str, Any]) -> Dict[str, Any]:
+	"""normalize_listing_from_search for a search item's already-resolved product and primary offer nodes"""
+	main_image = product.get("main_image")
+	if not main_image:
+		# Coerce images to strings if BlueCart returns objects
+		coerced_images = _coerce_images(product.get("images") or [])
+		main_image = coerced_images[0] if coerced_images else None
 	return {
-		"listing_id": _safe_get(product, "item_id") or _safe_get(product, "product_id"),
-		"title": _safe_get(product, "title"),
-		"brand": _safe_get(product, "brand"),
-		"price": _safe_get(primary, "price"),
-		"currency": currency_code,
-		"url": _safe_get(product, "link"),
+		"listing_id": product.get("item_id") or product.get("product_id"),
+		"title": product.get("title"),
+		"brand": product.get("brand"),
+		"price": primary.get("price"),
+		"currency": _CURRENCY_CODE.get(primary.get("currency_symbol") or ""),
+		"url": product.get("link"),
 		"image": main_image,
-		"asin": _safe_get(product, "asin"),
-		"upc": _safe_get(product, "upc") or _safe_get(product, "gtin"),
+		"asin": product.get("asin"),
+		"upc": product.get("upc") or product.get("gtin"),
 	}
 
 
 
 def normalize_product(item: Dict[str, Any]) -> Dict[str, Any]:
 	"""Enhanced product normalization with additional fields for Phase 2."""
-	images = _safe_get(item, "images") or _safe_get(item, "product", "images") or []
+	# builtins bound locally for the per-category / per-variant loops below
+	_isinstance, _str, _dict = isinstance, str, dict
+	nested = _as_dict(item.get("product"))
 	# Coerce to list[str]
-	coerced_images: List[str] = []
-	for img in images:
-		if isinstance(img, str):
-			coerced_images.append(img)
-		elif isinstance(img, dict):
-			for key in ("url", "link", "src", "image"):
-				val = img.get(key)
-				if isinstance(val, str):
-					coerced_images.append(val)
-					break
-	main_image = _safe_get(item, "main_image") or _safe_get(item, "product", "main_image")
+	coerced_images = _coerce_images(item.get("images") or nested.get("images") or [])
+	main_image = item.get("main_image") or nested.get("main_image")
 	if not coerced_images and isinstance(main_image, str):
 		coerced_images = [main_image]
 	
 	# Extract product data (handle nested product structure)
-	product_data = item.get("product") if isinstance(item.get("product"), dict) else item
+	product_data = nested if isinstance(item.get("product"), dict) else item
 	
 	# Extract category path
 	category_path = None
-	category_list = _safe_get(product_data, "categories") or _safe_get(product_data, "category") or []
+	category_list = product_data.get("categories") or product_data.get("category") or []
 	if isinstance(category_list, list) and len(category_list) > 0:
 		# If categories is a list of strings, join them
-		if all(isinstance(c, str) for c in category_list):
+		if all(_isinstance(c, _str) for c in category_list):
 			category_path = " > ".join(category_list)
 		# If categories is a list of objects with name/title fields
-		elif all(isinstance(c, dict) for c in category_list):
+		elif all(_isinstance(c, _dict) for c in category_list):
 			category_names = [c.get("name") or c.get("title") or "" for c in category_list if c.get("name") or c.get("title")]
 			if category_names:
 				category_path = " > ".join(category_names)
@@ -439,7 +523,7 @@ def normalize_product(item: Dict[str, Any]) -> Dict[str, Any]:
 	
 	# Extract dimensions
 	dimensions = None
-	dimensions_obj = _safe_get(product_data, "dimensions") or _safe_get(product_data, "package_dimensions") or {}
+	dimensions_obj = product_data.get("dimensions") or product_data.get("package_dimensions") or {}
 	if isinstance(dimensions_obj, dict):
 		length = dimensions_obj.get("length") or dimensions_obj.get("l")
 		width = dimensions_obj.get("width") or dimensions_obj.get("w")
@@ -450,7 +534,7 @@ def normalize_product(item: Dict[str, Any]) -> Dict[str, Any]:
 	
 	# Extract weight
 	weight = None
-	weight_obj = _safe_get(product_data, "weight") or _safe_get(product_data, "package_weight") or {}
+	weight_obj = product_data.get("weight") or product_data.get("package_weight") or {}
 	if isinstance(weight_obj, dict):
 		weight_value = weight_obj.get("value") or weight_obj.get("weight")
 		weight_unit = weight_obj.get("unit") or "lbs"
@@ -461,22 +545,22 @@ def normalize_product(item: Dict[str, Any]) -> Dict[str, Any]:
 	
 	# Extract reviews and rating
 	reviews_count = (
-		_safe_get(product_data, "reviews_count") or
-		_safe_get(product_data, "ratings_total") or
-		_safe_get(product_data, "total_reviews") or
-		_safe_get(product_data, "review_count") or
+		product_data.get("reviews_count") or
+		product_data.get("ratings_total") or
+		product_data.get("total_reviews") or
+		product_data.get("review_count") or
 		0
 	)
 	product_rating = (
-		_safe_get(product_data, "rating") or
-		_safe_get(product_data, "average_rating") or
-		_safe_get(product_data, "star_rating") or
+		product_data.get("rating") or
+		product_data.get("average_rating") or
+		product_data.get("star_rating") or
 		None
 	)
 	
 	# Extract shipping information
 	shipping_cost = None
-	shipping_info = _safe_get(product_data, "shipping") or _safe_get(product_data, "shipping_info") or {}
+	shipping_info = product_data.get("shipping") or product_data.get("shipping_info") or {}
 	if isinstance(shipping_info, dict):
 		shipping_cost = shipping_info.get("cost") or shipping_info.get("price") or shipping_info.get("shipping_cost")
 		if shipping_cost is None:
@@ -489,18 +573,18 @@ def normalize_product(item: Dict[str, Any]) -> Dict[str, Any]:
 	
 	# Extract estimated delivery
 	estimated_delivery = None
-	delivery_info = _safe_get(product_data, "delivery") or _safe_get(product_data, "estimated_delivery") or _safe_get(product_data, "shipping", "estimated_delivery") or {}
+	delivery_info = product_data.get("delivery") or product_data.get("estimated_delivery") or _as_dict(product_data.get("shipping")).get("estimated_delivery") or {}
 	if isinstance(delivery_info, dict):
 		estimated_delivery = delivery_info.get("text") or delivery_info.get("description") or delivery_info.get("days")
 	elif isinstance(delivery_info, str):
 		estimated_delivery = delivery_info
 	
 	# Extract variants
-	variants = _safe_get(product_data, "variants") or _safe_get(product_data, "product_variants") or []
+	variants = product_data.get("variants") or product_data.get("product_variants") or []
 	variant_list = []
 	if isinstance(variants, list):
 		for variant in variants:
-			if isinstance(variant, dict):
+			if _isinstance(variant, _dict):
 				variant_info = {
 					"variant_id": variant.get("id") or variant.get("variant_id"),
 					"title": variant.get("title") or variant.get("name"),
@@ -512,14 +596,14 @@ def normalize_product(item: Dict[str, Any]) -> Dict[str, Any]:
 				variant_list.append(variant_info)
 	
 	return {
-		"listing_id": _safe_get(item, "item_id") or _safe_get(item, "product_id") or _safe_get(item, "product", "item_id") or _safe_get(item, "product", "product_id"),
-		"sku": _safe_get(item, "sku") or _safe_get(item, "product", "sku"),
-		"title": _safe_get(item, "title") or _safe_get(item, "product", "title"),
-		"brand": _safe_get(item, "brand") or _safe_get(item, "product", "brand"),
-		"description": _safe_get(item, "description") or _safe_get(item, "product", "description") or _safe_get(item, "product", "description_full"),
+		"listing_id": item.get("item_id") or item.get("product_id") or nested.get("item_id") or nested.get("product_id"),
+		"sku": item.get("sku") or nested.get("sku"),
+		"title": item.get("title") or nested.get("title"),
+		"brand": item.get("brand") or nested.get("brand"),
+		"description": item.get("description") or nested.get("description") or nested.get("description_full"),
 		"images": coerced_images,
-		"asin": _safe_get(item, "asin") or _safe_get(item, "product", "asin"),
-		"upc": _safe_get(item, "upc") or _safe_get(item, "product", "upc") or _safe_get(item, "product", "gtin"),
+		"asin": item.get("asin") or nested.get("asin"),
+		"upc": item.get("upc") or nested.get("upc") or nested.get("gtin"),
 		# Phase 2: Additional fields
 		"category": category_path,
 		"dimensions": dimensions,
@@ -533,331 +617,343 @@ def normalize_product(item: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def normalize_offer(offer: Dict[str, Any]) -> Dict[str, Any]:
+	seller = _as_dict(offer.get("seller"))
 	return {
-		"seller_id": _safe_get(offer, "seller_id") or _safe_get(offer, "seller", "id"),
-		"seller_name": _safe_get(offer, "seller_name") or _safe_get(offer, "seller", "name"),
-		"seller_rating": _safe_get(offer, "seller_rating") or _safe_get(offer, "seller", "rating"),
-		"total_reviews": _safe_get(offer, "total_reviews") or _safe_get(offer, "seller", "reviews_count"),
-		"price": _safe_get(offer, "price"),
-		"currency": _safe_get(offer, "currency") or _safe_get(offer, "currency_symbol"),
-		"url": _safe_get(offer, "seller_url") or _safe_get(offer, "seller", "url"),
-		"quantity": _safe_get(offer, "quantity") or _safe_get(offer, "available_quantity") or _safe_get(offer, "inventory", "quantity"),
+		"seller_id": offer.get("seller_id") or seller.get("id"),
+		"seller_name": offer.get("seller_name") or seller.get("name"),
+		"seller_rating": offer.get("seller_rating") or seller.get("rating"),
+		"total_reviews": offer.get("total_reviews") or seller.get("reviews_count"),
+		"price": offer.get("price"),
+		"currency": offer.get("currency") or offer.get("currency_symbol"),
+		"url": offer.get("seller_url") or seller.get("url"),
+		"quantity": offer.get("quantity") or offer.get("available_quantity") or _as_dict(offer.get("inventory")).get("quantity"),
 	}
 
 
-def run(keyword_list: List[str], max_per_keyword: int, export: List[str], sleep: float, offers_export: bool, max_pages: int, debug: bool, walmart_domain: Optional[str] = None, category_id: Optional[str] = None, retry_seller_passes: int = 0, retry_seller_delay: float = 15.0) -> None:
-	"""Main scraping function with export"""
-	try:
-		init_db()
-		cfg = get_config()
-		# Use custom domain if provided, otherwise use default from config
-		domain_to_use = walmart_domain or cfg.site
-		client = BlueCartClient(sleep_seconds=sleep, site=domain_to_use)
-		print(f"[{_ts()}] Start scan | domain={client.site} | keywords={len(keyword_list)} | max_per_keyword={max_per_keyword} | max_pages={max_pages} | export={export}", flush=True)
+# Keywords that indicate toys/diecast (not real automotive parts)
+_TOY_KEYWORDS = ["toy", "diecast", "model car", "disney", "1:64", "1:24", "1:43", "scale", "collectible", "action figure"]
+# All toy keywords as one case-insensitive alternation: one scan per string instead of one per keyword
+_TOY_RE = re.compile("|".join(map(re.escape, _TOY_KEYWORDS)), re.IGNORECASE)
 
-		all_records: List[Dict[str, Any]] = []
-		all_offers: List[Dict[str, Any]] = []
-		# Cache and pending lists for seller retries
-		seller_cache: Dict[str, Dict[str, Any]] = {}  # Cache seller profiles to avoid duplicate API calls
-		pending_sellers: List[Tuple[Optional[str], Optional[str]]] = []
-
-		for kw in keyword_list:
-			print(f"[{_ts()}] Keyword: {kw}", flush=True)
-			collected = 0
-			print(f"[{_ts()}] Starting collection for keyword: {kw}", flush=True)
-			page = 1
-			# If max_per_keyword is 0 or negative, collect unlimited items
-			# If max_pages is 0 or negative, collect unlimited pages
-			max_items = max_per_keyword if max_per_keyword > 0 else float('inf')
-			max_page_limit = max_pages if max_pages > 0 else float('inf')
-			
-			# Check if we should use Walmart's "total_results" as the limit (exact matches only)
-			walmart_exact_match_limit = None
-			if page == 1:
-				# Get first page to check Walmart's total_results count
-				extra: Dict[str, Any] = {}
-				if category_id:
-					extra["category_id"] = category_id
-				first_page_resp = client.search(kw, page=1, extra=extra)
-				pagination = first_page_resp.get("pagination", {})
-				total_results = pagination.get("total_results")
-				if total_results and max_per_keyword == 0:
-					# If unlimited was requested, use Walmart's exact match count
-					walmart_exact_match_limit = total_results
-					print(f"[{_ts()}] Walmart reports {total_results} 'exact matches' (relevant results) - collecting only these", flush=True)
-			
-			# Use Walmart's limit if available, otherwise use max_per_keyword
-			effective_max_items = walmart_exact_match_limit if walmart_exact_match_limit else max_items
-			
-			while collected < effective_max_items and page <= max_page_limit:
-				max_display = effective_max_items if effective_max_items != float('inf') else 'unlimited'
-				print(f"[{_ts()}]  Page {page} | Collected so far: {collected}/{max_display}", flush=True)
-				extra: Dict[str, Any] = {}
-				if category_id:
-					extra["category_id"] = category_id
+# Concurrent Product API calls per chunk of search items (the client caps total in-flight requests)
+_MAX_PRODUCT_WORKERS = 16
+
+
+# Keys BlueCart has used for the result list, at the top level or under a "data" container
+_SEARCH_ITEM_KEYS = ("search_results", "items", "results")
+
+
+def _search_items(search_resp: Dict[str, Any]) -> List[Any]:
+	"""The result list of a search response: first non-empty known key, then the same keys under "data"."""
+	for node in (search_resp, search_resp.get("data")):
+		if isinstance(node, dict):
+			for key in _SEARCH_ITEM_KEYS:
+				items = node.get(key)
+				if items:
+					return items
+	return []
+
+
+def _iter_page_candidates(items: List[Dict[str, Any]], kw: str, seen_this_keyword: set, debug: bool) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any], str, Dict[str, Any], Dict[str, Any]]]:
+	"""Yield (raw, listing, listing_id, raw_product, primary_offer) for new search items that pass the toy and brand filters.
+
+	Lazy on purpose: an item is only filtered, and marked seen, once the caller takes it.
+	The product and primary offer nodes are resolved once here and shared by every later step.
+	The id and filter checks read the search product directly (the listing fields come from it),
+	so only surviving items pay for listing normalization.
+	"""
+	for raw in items:
+		raw_product = _as_dict(raw.get("product"))
+		raw_listing_id = raw_product.get("item_id") or raw_product.get("product_id")
+		listing_id = str(raw_listing_id) if raw_listing_id is not None else None
+		if not listing_id:
+			continue
+		# Skip if we've already seen this listing_id in this keyword scan
+		if listing_id in seen_this_keyword:
+			continue
+		
+		# Filter out toy/diecast products for automotive searches
+		# Check title and brand for toy-related keywords
+		if _TOY_RE.search(raw_product.get("title") or "") or _TOY_RE.search(raw_product.get("brand") or ""):
+			continue
+		
+		# DATA QUALITY: Brand filtering to remove false positives
+		product_title = raw_product.get("title") or ""
+		product_brand = raw_product.get("brand") or ""
+		if not is_brand_match(kw, product_title, product_brand, raw_product):
+			if debug:
+				_kw_print(kw, f"  ❌ Brand filter: Skipping false positive - '{product_title[:50]}...' (keyword: {kw})")
+			continue
+		
+		seen_this_keyword.add(listing_id)
+		primary_offer = _primary_offer_of(raw)
+		yield raw, _listing_from_nodes(raw_product, primary_offer), listing_id, raw_product, primary_offer
+
+
+def _product_api_reason(kw: str, search_offer: Dict[str, Any], raw_product: Dict[str, Any], retry_seller_passes: int, debug: bool) -> Optional[str]:
+	"""Why a search item needs a Product API call, or None when search data is enough.
+
+	COST OPTIMIZATION: only missing product data/UPC, or a UUID seller without a URL
+	when seller enrichment will run, is worth a call. Walmart.com items never need one for the seller.
+	"""
+	needs_product_api_for_seller = False
+	# The seller only matters when enrichment will run (or for the debug trace)
+	if retry_seller_passes > 0 or debug:
+		search_seller = _as_dict(search_offer.get("seller"))
+		# Check seller name FIRST from search results - skip API calls for Walmart.com
+		search_seller_name = (search_seller.get("name") or search_offer.get("seller_name") or "").casefold()
+		is_walmart_seller = search_seller_name in _WALMART_NAMES
+		if retry_seller_passes > 0 and not is_walmart_seller:
+			# If we have seller URL from search, we can enrich via seller_profile(url=seller_url),
+			# and a numeric seller ID lets us construct https://www.walmart.com/seller/{id}
+			if not (search_seller.get("url") or search_seller.get("link")):
+				search_seller_id = search_seller.get("id") or search_offer.get("seller_id")
+				if not (search_seller_id and _is_numeric_string(search_seller_id)):
+					# UUID seller ID + missing URL - need Product API for both
+					needs_product_api_for_seller = True
+					if debug:
+						_kw_print(kw, f"  UUID seller ID + missing URL - will call product API")
+				elif debug:
+					_kw_print(kw, f"  Numeric seller ID - will construct URL, skipping product API")
+			elif debug:
+				_kw_print(kw, f"  ✅ Seller URL exists - skipping product API (will enrich via URL)")
+		elif is_walmart_seller and debug:
+			_kw_print(kw, f"  ⏭️  Walmart.com seller - skipping product API call")
+	
+	# Check if we have product data (sku/description/brand) and UPC
+	has_product_data = raw_product and (raw_product.get("sku") or raw_product.get("description") or raw_product.get("brand"))
+	has_upc = raw_product and (raw_product.get("upc") or raw_product.get("gtin"))
+	if needs_product_api_for_seller:
+		return "UUID seller - need seller URL"
+	if not has_upc:
+		return "missing UPC"
+	if not has_product_data:
+		return "missing product data"
+	return None
+
+
+def _seller_key(seller_id: Any, seller_url: Optional[str]) -> Optional[Tuple[Optional[str], Optional[str]]]:
+	"""Seller enrichment key: (numeric_id, None) when the id is numeric, else (None, url); None if neither.
+
+	The key only deduplicates sellers and keys seller_cache; the seller_profile call still gets
+	the seller URL seen with it (see pending_sellers).
+	"""
+	if seller_id and _is_numeric_string(seller_id):
+		return (str(seller_id), None)
+	return (None, seller_url) if seller_url else None
+
+
+# Record keys used only for seller enrichment tracking, never exported
+_INTERNAL_KEYS = ("_primary_seller_id", "_primary_seller_url")
+
+# Seller fields the retry pass can fill in from seller_profile
+_ENRICHED_SELLER_FIELDS = ("email_address", "phone_number", "address", "country", "state_province", "zip_code", "seller_profile_picture", "seller_profile_url", "business_legal_name", "seller_rating", "total_reviews")
+
+
+def _finalize_record(r: Dict[str, Any], seller_cache: Dict[Tuple[Optional[str], Optional[str]], Dict[str, Any]]) -> Dict[str, Any]:
+	"""Merge enriched seller data into a crawled record and strip internal keys for export"""
+	key = _seller_key(r.get("_primary_seller_id"), r.get("_primary_seller_url"))
+	fields = seller_cache.get(key) if key else None
+	if fields:
+		for k in _ENRICHED_SELLER_FIELDS:
+			if fields.get(k):
+				# Always update seller_profile_url if available from enrichment (it's more complete)
+				if k == "seller_profile_url":
+					r["seller_profile_url"] = fields[k]
+				# For other fields, only update if not already set
+				elif not r.get(k):
+					r[k] = fields[k]
+	for k in _INTERNAL_KEYS:
+		r.pop(k, None)
+	return r
+
+
+class _Pacer:
+	"""Thread-safe token bucket handing out request start times at most one interval apart.
+
+	A caller whose slot has already passed starts immediately, so fast responses
+	are not followed by a fixed sleep.
+	"""
+
+	def __init__(self, interval: float):
+		self.interval = interval
+		self._next_at = time.monotonic()
+		self._lock = threading.Lock()
+
+	def wait(self) -> None:
+		with self._lock:
+			now = time.monotonic()
+			start = max(self._next_at, now)
+			self._next_at = start + self.interval
+		if start > now:
+			time.sleep(start - now)
+
+
+# Default upper bound on keywords crawled concurrently (BlueCart calls are I/O-bound)
+_MAX_KEYWORD_WORKERS = 8
+
+# Default seller_profile calls in flight during the retry pass (matches the client's connection pool)
+_SELLER_WORKERS = 16
+
+# Default API response cache capacity: large enough that a product found by an early keyword is
+# still cached when a later keyword finds it, even after thousands of search/product calls
+_API_CACHE_SIZE = 50_000
+
+
+def _scan_keyword(kw: str, client: BlueCartClient, db: SnapshotWriter, max_per_keyword: int, offers_export: bool, max_pages: int, debug: bool, debug_stream: Optional[DebugStream] = None, category_id: Optional[str] = None, retry_seller_passes: int = 0) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[Tuple[Optional[str], Optional[str]], Optional[str]]]:
+	"""Crawl one keyword; returns its (records, offers, pending_sellers) for run() to merge"""
+	keyword_records: List[Dict[str, Any]] = []
+	keyword_offers: List[Dict[str, Any]] = []
+	# Seller key -> first seller URL seen with it, deduplicated on insert (dict keeps first-seen order)
+	pending_sellers: Dict[Tuple[Optional[str], Optional[str]], Optional[str]] = {}
+	_kw_print(kw, f"Keyword: {kw}")
+	collected = 0
+	_kw_print(kw, f"Starting collection for keyword: {kw}")
+	page = 1
+	# If max_per_keyword is 0 or negative, collect unlimited items
+	# If max_pages is 0 or negative, collect unlimited pages
+	max_items = max_per_keyword if max_per_keyword > 0 else float('inf')
+	max_page_limit = max_pages if max_pages > 0 else float('inf')
+	
+	# Check if we should use Walmart's "total_results" as the limit (exact matches only)
+	walmart_exact_match_limit = None
+	extra: Dict[str, Any] = {}
+	if category_id:
+		extra["category_id"] = category_id
+	# Get first page to check Walmart's total_results count; the same response
+	# is reused as page 1 of the loop below instead of being fetched twice
+	first_page_resp = client.search(kw, page=1, extra=extra)
+	pagination = first_page_resp.get("pagination", {})
+	total_results = pagination.get("total_results")
+	if total_results and max_per_keyword == 0:
+		# If unlimited was requested, use Walmart's exact match count
+		walmart_exact_match_limit = total_results
+		_kw_print(kw, f"Walmart reports {total_results} 'exact matches' (relevant results) - collecting only these")
+	preloaded: Optional[Dict[str, Any]] = first_page_resp
+	
+	# Use Walmart's limit if available, otherwise use max_per_keyword
+	effective_max_items = walmart_exact_match_limit if walmart_exact_match_limit else max_items
+	# Track listing_ids seen for this keyword across all pages
+	seen_this_keyword: set = set()
+	
+	# The next page's search runs in the background while this page's products are fetched,
+	# but only once that page is certain to be read (see can_prefetch below)
+	with ThreadPoolExecutor(max_workers=1) as prefetch_pool:
+		next_search: Optional[Future] = None
+		while collected < effective_max_items and page <= max_page_limit:
+			max_display = effective_max_items if effective_max_items != float('inf') else 'unlimited'
+			_kw_print(kw, f" Page {page} | Collected so far: {collected}/{max_display}")
+			if page == 1 and preloaded is not None:
+				search_resp = preloaded
+				preloaded = None
+			elif next_search is not None:
+				search_resp = next_search.result()
+				next_search = None
+			else:
 				search_resp = client.search(kw, page=page, extra=extra)
-				if debug and page == 1:
-					write_debug_json(search_resp, f"debug_search_{kw.replace(' ', '_')}.json")
-				items = search_resp.get("search_results") or search_resp.get("items") or []
-				# BlueCart sometimes nests results under "results" or "search_results"; also check "data" container
-				if not items:
-					items = (search_resp.get("results") or [])
-				if not items and isinstance(search_resp.get("data"), dict):
-					data = search_resp["data"]
-					items = data.get("search_results") or data.get("items") or data.get("results") or []
-				if not items:
-					print(f"[{_ts()}]   No items returned; stopping pagination for keyword", flush=True)
+			if debug and page == 1:
+				debug_stream.write(f"search:{kw}", search_resp)
+			items = _search_items(search_resp)
+			if not items:
+				_kw_print(kw, f"  No items returned; stopping pagination for keyword")
+				break
+			_kw_print(kw, f"  Found {len(items)} items on page {page}")
+			# Even if every item here is kept the limit is not reached, so budget remains for the next page
+			can_prefetch = page + 1 <= max_page_limit and collected + len(items) < effective_max_items
+		
+			# Track items added this page to detect if we're getting duplicates
+			items_added_this_page = 0
+			# SQLite rows for this page, handed to the writer as one executemany batch each
+			page_summaries: List[Tuple[str, Optional[str], Optional[str], Optional[str]]] = []
+			page_listing_snapshots: List[Tuple[str, Dict[str, Any]]] = []
+			page_seller_snapshots: List[Tuple[str, str, Dict[str, Any]]] = []
+			# Items are filtered lazily and taken in chunks no larger than the remaining item budget,
+			# so a chunk's Product API calls run concurrently without fetching past the limit
+			candidates = _iter_page_candidates(items, kw, seen_this_keyword, debug)
+			while True:
+				budget = max_per_keyword - collected if max_per_keyword > 0 else len(items)
+				chunk = list(islice(candidates, budget)) if budget > 0 else []
+				if not chunk:
 					break
-				print(f"[{_ts()}]   Found {len(items)} items on page {page}", flush=True)
-				
-				# Track items added this page to detect if we're getting duplicates
-				items_added_this_page = 0
-				seen_this_keyword: set = set()  # Track listing_ids seen for this keyword
-				for raw in items:
-					# Skip limit check if max_per_keyword is 0 or negative (unlimited)
-					if max_per_keyword > 0 and collected >= max_per_keyword:
-						break
-					listing = normalize_listing_from_search(raw)
-					listing_id = str(listing.get("listing_id")) if listing.get("listing_id") is not None else None
-					if not listing_id:
-						continue
-					# Skip if we've already seen this listing_id in this keyword scan
-					if listing_id in seen_this_keyword:
-						continue
-					
-					# Filter out toy/diecast products for automotive searches
-					# Check title and brand for toy-related keywords
-					title_lower = (listing.get("title") or "").lower()
-					brand_lower = (listing.get("brand") or "").lower()
-					product_title_lower = (_safe_get(raw, "product", "title") or "").lower()
-					
-					# Keywords that indicate toys/diecast (not real automotive parts)
-					toy_keywords = ["toy", "diecast", "model car", "disney", "1:64", "1:24", "1:43", "scale", "collectible", "action figure"]
-					
-					# Check if product is a toy
-					is_toy = any(keyword in title_lower or keyword in brand_lower or keyword in product_title_lower 
-								for keyword in toy_keywords)
-					
-					if is_toy:
-						# Skip toy products for automotive searches
-						continue
-					
-					# DATA QUALITY: Brand filtering to remove false positives
-					product_title = listing.get("title") or _safe_get(raw, "product", "title") or ""
-					product_brand = listing.get("brand") or _safe_get(raw, "product", "brand") or ""
-					if not is_brand_match(kw, product_title, product_brand, raw_product):
-						if debug:
-							print(f"[{_ts()}]   ❌ Brand filter: Skipping false positive - '{product_title[:50]}...' (keyword: {kw})", flush=True)
-						continue
-					
-					seen_this_keyword.add(listing_id)
-					upsert_listing_summary(listing_id, listing.get("listing_title"), listing.get("brand"), listing.get("url"))
-					# OPTIMIZATION: Try to use product data from search results first, only call API if needed
-					product_data = {}
+				# Prefetch only once this page is known to add a listing (a candidate with a valid price is
+				# always collected), so the all-duplicates stop can no longer fire and the call is never wasted
+				if can_prefetch and next_search is None and any(validate_price_and_stock(c[1].get("price"))[0] for c in chunk):
+					next_search = prefetch_pool.submit(client.search, kw, page=page + 1, extra=extra)
+				reasons = [_product_api_reason(kw, primary_offer, raw_product, retry_seller_passes, debug) for _, _, _, raw_product, primary_offer in chunk]
+				fetched = client.product_batch([c[2] for c, reason in zip(chunk, reasons) if reason], max_workers=_MAX_PRODUCT_WORKERS)
+				for (raw, listing, listing_id, raw_product, primary_offer), reason in zip(chunk, reasons):
+					page_summaries.append((listing_id, listing.get("title"), listing.get("brand"), listing.get("url")))
 					product_resp = None
-					raw_product = _safe_get(raw, "product", default={})
-					
-					# Check seller name FIRST from search results - skip API calls for Walmart.com
-					search_seller_name = (
-						_safe_get(raw, "offers", "primary", "seller", "name") or
-						_safe_get(raw, "offers", "primary", "seller_name") or
-						""
-					).lower()
-					is_walmart_seller = search_seller_name in ("walmart.com", "walmart", "walmart inc.")
-					
-					# Check seller ID from search results first
-					search_seller_id = _safe_get(raw, "offers", "primary", "seller", "id") or _safe_get(raw, "offers", "primary", "seller_id")
-					has_numeric_seller_id = search_seller_id and _is_numeric_string(str(search_seller_id))
-					has_seller_url = _safe_get(raw, "offers", "primary", "seller", "url") or _safe_get(raw, "offers", "primary", "seller", "link")
-					
-					# OPTIMIZATION: Skip product API calls when possible
-					# Key insight: If search results have seller URL, we can enrich via seller_profile API directly!
-					# Only call Product API if we REALLY need it:
-					# 1. Missing product data (sku/description/brand) AND missing seller URL
-					# 2. OR missing seller URL AND we need numeric seller ID (but seller_profile accepts URL too!)
-					needs_product_api_for_seller = False
-					# Check if we have product data (sku/description/brand)
-					has_product_data = raw_product and (raw_product.get("sku") or raw_product.get("description") or raw_product.get("brand"))
-					# Check if we have UPC
-					has_upc = raw_product and (raw_product.get("upc") or raw_product.get("gtin"))
-					# Need Product API if missing product data OR missing UPC
-					needs_product_api_for_data = not (has_product_data and has_upc)
-					
-					if retry_seller_passes > 0 and not is_walmart_seller:
-						# OPTIMIZATION: If we have seller URL from search, skip Product API!
-						# We can enrich seller directly via seller_profile(url=seller_url)
-						if not has_seller_url:
-							# Missing seller URL - need Product API to get it
-							if not has_numeric_seller_id:
-								# UUID seller ID + missing URL - need Product API for both
-								needs_product_api_for_seller = True
-								if debug:
-									print(f"[{_ts()}]   UUID seller ID + missing URL - will call product API")
-							else:
-								# Numeric seller ID but missing URL - can construct URL, but Product API might have better data
-								# Actually, we can construct URL from numeric ID: https://www.walmart.com/seller/{id}
-								# So skip Product API if we have numeric ID!
-								if debug:
-									print(f"[{_ts()}]   Numeric seller ID - will construct URL, skipping product API")
-						else:
-							# We have seller URL! Skip Product API - can enrich via seller_profile(url)
-							if debug:
-								print(f"[{_ts()}]   ✅ Seller URL exists - skipping product API (will enrich via URL)")
-					elif is_walmart_seller:
+					if reason:
 						if debug:
-							print(f"[{_ts()}]   ⏭️  Walmart.com seller - skipping product API call")
-					
-					# COST OPTIMIZATION: Minimize Product API calls
-					# Only call Product API if ABSOLUTELY necessary (missing critical product data)
-					# Skip Product API if we have seller URL (can enrich via seller_profile if needed)
-					# Skip Product API for Walmart.com sellers (no enrichment needed)
-					
-					# Check if search result already has sufficient product data AND UPC
-					# BUT: Always call Product API if we need seller URL for UUID sellers OR missing UPC
-					if has_product_data and has_upc and not needs_product_api_for_seller:
-						# Use data from search results - skip API call to save costs
-						# UNLESS we need seller URL for UUID sellers OR missing UPC
-						product_data = normalize_product(raw_product)
-						product_resp = None
-						if debug:
-							print(f"[{_ts()}]   ⚡ Using search results data - skipping product API (cost savings)")
-					else:
-						# Call Product API if:
-						# 1. Missing critical product data OR missing UPC, OR
-						# 2. Need seller URL for UUID sellers (needs_product_api_for_seller)
-						if needs_product_api_for_data or needs_product_api_for_seller:
-							try:
-								if debug:
-									if needs_product_api_for_seller:
-										print(f"[{_ts()}]   Calling product API (UUID seller - need seller URL)")
-									elif not has_upc:
-										print(f"[{_ts()}]   Calling product API (missing UPC)")
-									else:
-										print(f"[{_ts()}]   Calling product API (missing product data)")
-								product_resp = client.product(listing_id)
-								if debug:
-									write_debug_json(product_resp, f"debug_product_{listing_id}.json")
-								product_data = normalize_product(product_resp.get("product") or product_resp)
-								if debug:
-									print(f"[{_ts()}]   Product API call successful")
-							except Exception as e:
-								if debug:
-									print(f"[{_ts()}]   Product API call failed: {e}")
-								product_resp = None
-								product_data = normalize_product(raw_product) if raw_product else {}
-						else:
-							# Skip Product API - use search results only
-							product_data = normalize_product(raw_product) if raw_product else {}
-							product_resp = None
+							_kw_print(kw, f"  Calling product API ({reason})")
+						try:
+							result = fetched[listing_id]
+							if isinstance(result, Exception):
+								raise result
+							product_resp = result
 							if debug:
-								print(f"[{_ts()}]   ⚡ Skipping product API (cost savings)")
-					primary_offer = _safe_get(raw, "offers", "primary") or {}
+								debug_stream.write(f"product:{listing_id}", product_resp)
+							product_data = normalize_product(product_resp.get("product") or product_resp)
+							if debug:
+								_kw_print(kw, f"  Product API call successful")
+						except Exception as e:
+							if debug:
+								_kw_print(kw, f"  Product API call failed: {e}")
+							product_resp = None
+							product_data = normalize_product(raw_product) if raw_product else {}
+					else:
+						# Search results are enough - skip the Product API call to save costs
+						product_data = normalize_product(raw_product) if raw_product else {}
+						if debug:
+							_kw_print(kw, f"  ⚡ Using search results data - skipping product API (cost savings)")
+					primary_seller = _as_dict(primary_offer.get("seller"))
 					offers = [primary_offer] if primary_offer else []
 					normalized_offers = [normalize_offer(o) for o in offers]
 					# Derive primary seller details and try enrichment via BlueCart (US only), else product page scrape
 					primary_o = normalized_offers[0] if normalized_offers else {}
-					
-					# IMPORTANT: Product API has better seller data (numeric ID and URL)
-					# Check product API response for seller data first
-					# Product API structure: product.buybox_winner.seller (NOT offers.primary.seller!)
-					product_obj = product_resp.get("product") if isinstance(product_resp, dict) else (product_resp or {})
-					product_buybox = _safe_get(product_obj, "buybox_winner") or {}
-					product_offer = _safe_get(product_resp or {}, "offers", "primary") or product_buybox or {}
-					product_seller = _safe_get(product_buybox, "seller") or _safe_get(product_offer, "seller") or {}
-					
-					# Get seller URL from multiple sources (product API has best data)
-					seller_url_from_offer = (
-						_safe_get(product_seller, "link") or  # Product API: offers.primary.seller.link
-						_safe_get(product_offer, "seller", "link") or
-						primary_o.get("url") or 
-						_safe_get(primary_offer, "seller", "url") or 
-						_safe_get(primary_offer, "seller_url") or
-						_safe_get(primary_offer, "url") or
-						_safe_get(raw, "offers", "primary", "seller", "url") or
-						_safe_get(raw, "offers", "primary", "url")
-					)
-					
-					# Get seller ID from multiple sources (product API has numeric ID)
-					# Product API has: offers.primary.seller.id (numeric) and id_secondary (UUID)
-					seller_id = (
-						_safe_get(product_seller, "id") or  # Product API: offers.primary.seller.id (NUMERIC!)
-						_safe_get(product_offer, "seller", "id") or
-						primary_o.get("seller_id") or 
-						_safe_get(primary_offer, "seller", "id") or 
-						_safe_get(primary_offer, "seller_id") or
-						_collect_numeric_seller_id(raw) or
-						_collect_numeric_seller_id(product_resp or {})
-					)
-					
-					# Try to extract numeric seller ID from seller URL if available
-					# Pattern: https://www.walmart.com/seller/{numeric_id}
-					if seller_url_from_offer and "/seller/" in seller_url_from_offer:
-						try:
-							url_parts = seller_url_from_offer.split("/seller/")
-							if len(url_parts) > 1:
-								potential_id = url_parts[1].split("/")[0].split("?")[0].strip()
-								if _is_numeric_string(potential_id):
-									seller_id = potential_id  # Use numeric ID from URL
-						except Exception:
-							pass
-					
-					# REMOVED: offers API call - too slow, causes 10+ min delays per item
-					# Seller URL will be constructed from seller_id or from seller enrichment later
-					# If still no URL, construct it from seller_id (don't call API here - too slow)
-					# Seller enrichment will get the URL later if needed
-					if not seller_url_from_offer and seller_id and _is_numeric_string(str(seller_id)):
-						seller_url_from_offer = f"https://www.walmart.com/seller/{seller_id}"
-					enriched: Dict[str, Any] = {}
-					# Try BlueCart seller_profile using numeric seller_id if present anywhere in raw/product payloads
-					numeric_sid: Optional[str] = None
-					if primary_o.get("seller_id") and _is_numeric_string(str(primary_o.get("seller_id"))):
-						numeric_sid = str(primary_o.get("seller_id"))
-					else:
-						# search the raw search item for a numeric seller id
-						numeric_sid = _collect_numeric_seller_id(raw) or _collect_numeric_seller_id(product_resp or {})
+			
+					# Product API has better seller data (numeric ID and URL) than the search item
+					seller_url_from_offer, seller_id = _extract_seller(raw, primary_offer, primary_o, product_resp)
 					# Extract seller name from multiple sources (needed for debug and later use)
 					seller_name = (
 						primary_o.get("seller_name") or
-						_safe_get(primary_offer, "seller", "name") or
-						_safe_get(primary_offer, "seller_name") or
-						_safe_get(raw, "offers", "primary", "seller", "name") or
-						_safe_get(raw, "offers", "primary", "seller_name") or
+						primary_seller.get("name") or
+						primary_offer.get("seller_name") or
 						"Unknown Seller"
 					)
 					# DISABLED: Seller enrichment removed due to API timeouts
 					# Just use basic seller info from search results - no enrichment needed
 					# Optional debug for each collected item
+					id_without_url = bool(seller_id) and not seller_url_from_offer
 					if debug:
 						seller_url = seller_url_from_offer or primary_o.get("url") or "N/A"
-						print(f"[{_ts()}]   Seller debug listing_id={listing_id} seller_id={seller_id} name={seller_name} url={seller_url}")
-					# Debug: Log when we find seller IDs but no URLs (to help identify which sellers have IDs)
-					if seller_id and not seller_url_from_offer:
-						if debug:
-							print(f"[{_ts()}]   ⚠️ Found seller_id={seller_id} for seller={seller_name} but no URL constructed!")
-					# Debug: Log seller ID extraction for non-Walmart sellers to see what we're getting
-					# This helps identify which sellers have IDs and which don't
-					if seller_name and seller_name.lower() not in ("walmart.com", "walmart", "walmart inc."):
+						_kw_print(kw, f"  Seller debug listing_id={listing_id} seller_id={seller_id} name={seller_name} url={seller_url}")
+						# Debug: Log when we find seller IDs but no URLs (to help identify which sellers have IDs)
+						if id_without_url:
+							_kw_print(kw, f"  ⚠️ Found seller_id={seller_id} for seller={seller_name} but no URL constructed!")
+					# Log seller ID extraction for non-Walmart sellers; outside debug only the
+					# ID-without-URL anomaly is reported, so the common case skips this block
+					if (debug or id_without_url) and seller_name and seller_name.casefold() not in _WALMART_NAMES:
 						if seller_id and seller_url_from_offer:
 							# Success case - we found both ID and URL
-							if debug:
-								print(f"[{_ts()}]   ✅ Seller={seller_name} has seller_id={seller_id} and URL={seller_url_from_offer[:50]}...")
-						elif seller_id and not seller_url_from_offer:
+							_kw_print(kw, f"  ✅ Seller={seller_name} has seller_id={seller_id} and URL={seller_url_from_offer[:50]}...")
+						elif id_without_url:
 							# We have ID but didn't construct URL - this shouldn't happen with current logic
-							print(f"[{_ts()}]   ⚠️  Found seller_id={seller_id} for seller={seller_name} but no URL constructed (listing_id={listing_id})")
+							_kw_print(kw, f"  ⚠️  Found seller_id={seller_id} for seller={seller_name} but no URL constructed (listing_id={listing_id})")
 						elif not seller_id and not seller_url_from_offer:
 							# No ID found - API limitation
-							if debug:
-								print(f"[{_ts()}]   ❌ No seller_id found for seller={seller_name} (listing_id={listing_id}) - API doesn't provide it")
+							_kw_print(kw, f"  ❌ No seller_id found for seller={seller_name} (listing_id={listing_id}) - API doesn't provide it")
 					# Store history
-					insert_listing_snapshot(listing_id, {
+					page_listing_snapshots.append((listing_id, {
 						"keyword": kw,
 						"listing": listing,
 						"product": product_data,
 						"offers": normalized_offers,
-					})
+					}))
 					for o in normalized_offers:
 						if o.get("seller_id"):
-							insert_seller_snapshot(listing_id, str(o["seller_id"]), o)
+							page_seller_snapshots.append((listing_id, str(o["seller_id"]), o))
 						if offers_export:
 							# Try to enrich seller details by visiting the product page and discovering the seller profile URL
 							# Simplified: skip seller profile enrichment for now
@@ -880,55 +976,48 @@ def run(keyword_list: List[str], max_per_keyword: int, export: List[str], sleep:
 								"phone_number": offer_enriched.get("phone_number"),
 								"address": offer_enriched.get("address"),
 							}
-							all_offers.append(row)
+							keyword_offers.append(row)
 					# Accumulate for export (Listings schema)
 					images_list = product_data.get("images") or ([listing.get("image")] if listing.get("image") else [])
-					images_joined = "|".join(images_list) if images_list else None
-					in_stock = _safe_get(raw, "inventory", "in_stock")
+					inventory = _as_dict(raw.get("inventory"))
+					product_inventory = _as_dict(_as_dict(product_resp.get("product")).get("inventory")) if product_resp else {}
+					in_stock = inventory.get("in_stock")
 					# Extract units_available from offers, inventory, or product data
-					# Try multiple sources, but don't default to 1 - leave as None if not found
-					units_available = None
-					if primary_o.get("quantity") is not None:
-						units_available = primary_o.get("quantity")
-					elif _safe_get(raw, "inventory", "quantity") is not None:
-						units_available = _safe_get(raw, "inventory", "quantity")
-					elif _safe_get(raw, "inventory", "available_quantity") is not None:
-						units_available = _safe_get(raw, "inventory", "available_quantity")
-					elif _safe_get(product_resp or {}, "product", "inventory", "quantity") is not None:
-						units_available = _safe_get(product_resp or {}, "product", "inventory", "quantity")
-					elif _safe_get(product_resp or {}, "product", "inventory", "available_quantity") is not None:
-						units_available = _safe_get(product_resp or {}, "product", "inventory", "available_quantity")
-					# If still None, leave it as None (don't default to 1)
+					# First source that is set wins; don't default to 1 - leave as None if not found
+					units_available = next((q for q in (
+						primary_o.get("quantity"),
+						inventory.get("quantity"),
+						inventory.get("available_quantity"),
+						product_inventory.get("quantity"),
+						product_inventory.get("available_quantity"),
+					) if q is not None), None)
 					# seller_name already extracted above (before debug section)
-					# Check if seller is Walmart by comparing seller names (handle None safely)
-					_seller_name_from_offer = _safe_get(primary_offer, "seller", "name", default="") or ""
-					_seller_name_from_primary_o = primary_o.get("seller_name", "") or ""
-					_is_walmart = False
-					if _seller_name_from_primary_o and isinstance(_seller_name_from_primary_o, str):
-						_is_walmart = _seller_name_from_primary_o.lower() in ("walmart.com", "walmart", "walmart inc.")
-					if not _is_walmart and _seller_name_from_offer and isinstance(_seller_name_from_offer, str):
-						_is_walmart = _seller_name_from_offer.lower() in ("walmart.com", "walmart", "walmart inc.")
+					# Check if seller is Walmart: either seller-name source may say so (handle non-str safely)
+					_is_walmart = any(
+						isinstance(name, str) and name.casefold() in _WALMART_NAMES
+						for name in (primary_o.get("seller_name"), primary_seller.get("name"))
+					)
 					# DATA QUALITY: Validate seller URL
 					validated_seller_url, is_valid_url = validate_seller_url(seller_url_from_offer, seller_id, seller_name)
-					if not is_valid_url and seller_id and _is_numeric_string(str(seller_id)):
+					if not is_valid_url and seller_id and _is_numeric_string(seller_id):
 						validated_seller_url = f"https://www.walmart.com/seller/{seller_id}"
 						is_valid_url = True
 					final_seller_url = validated_seller_url if is_valid_url else (seller_url_from_offer or "")
-					
+			
 					# DATA QUALITY: Price validation - filter out invalid prices
 					product_price = listing.get("price")
 					is_price_valid, price_info = validate_price_and_stock(product_price, units_available)
 					if not is_price_valid:
 						if debug:
-							print(f"[{_ts()}]   ❌ Price validation: Skipping product with invalid price (price: {product_price}, status: {price_info.get('stock_status')})", flush=True)
+							_kw_print(kw, f"  ❌ Price validation: Skipping product with invalid price (price: {product_price}, status: {price_info.get('stock_status')})")
 						continue
-					
+			
 					# DATA QUALITY: Enhanced UPC collection from multiple sources
 					enhanced_upc = collect_upc_from_multiple_sources(raw_product, product_resp, raw)
 					if not enhanced_upc:
 						# Fallback to existing UPC collection
 						enhanced_upc = listing.get("upc") or product_data.get("upc")
-					
+			
 					# Phase 2: Extract additional product fields
 					product_category = product_data.get("category") or ""
 					product_dimensions = product_data.get("dimensions") or ""
@@ -938,7 +1027,7 @@ def run(keyword_list: List[str], max_per_keyword: int, export: List[str], sleep:
 					shipping_cost = product_data.get("shipping_cost") or ""
 					estimated_delivery = product_data.get("estimated_delivery") or ""
 					product_variants = product_data.get("variants")
-					
+			
 					# Format variants as string if available
 					variants_str = ""
 					if product_variants and isinstance(product_variants, list):
@@ -956,12 +1045,12 @@ def run(keyword_list: List[str], max_per_keyword: int, export: List[str], sleep:
 									variant_strings.append(" | ".join(variant_parts))
 						if variant_strings:
 							variants_str = " || ".join(variant_strings)
-					
+			
 					combined = {
 						"keyword": kw,
 						"listing_id": listing_id,
 						"listing_title": listing.get("title"),
-						"product_images": images_joined,
+						"product_images": images_list or None,
 						"product_sku": product_data.get("sku"),
 							"item_number": listing_id,
 							"price": price_info.get("price"),  # Use validated price
@@ -987,13 +1076,10 @@ def run(keyword_list: List[str], max_per_keyword: int, export: List[str], sleep:
 							# Seller fields (from primary offer - will be enriched later)
 							"seller_name": seller_name,
 							"seller_profile_url": final_seller_url,  # Use validated URL
-							"seller_rating": primary_o.get("seller_rating") or _safe_get(primary_offer, "seller", "rating"),
-							"total_reviews": primary_o.get("total_reviews") or _safe_get(primary_offer, "seller", "reviews_count"),
-							# Set Walmart contact info if seller is Walmart
-							"email_address": "help@walmart.com" if _is_walmart else "",
-							"business_legal_name": "Walmart Inc." if _is_walmart else "",
-							"phone_number": "1-800-925-6278" if _is_walmart else "",
-							"address": "702 SW 8th St, Bentonville, AR 72716, USA" if _is_walmart else "",
+							"seller_rating": primary_o.get("seller_rating") or primary_seller.get("rating"),
+							"total_reviews": primary_o.get("total_reviews") or primary_seller.get("reviews_count"),
+								# Set Walmart contact info if seller is Walmart
+							**(_WALMART_CONTACT if _is_walmart else _EMPTY_CONTACT),
 							"country": "",
 							"state_province": "",
 							"zip_code": "",
@@ -1002,8 +1088,8 @@ def run(keyword_list: List[str], max_per_keyword: int, export: List[str], sleep:
 							"_primary_seller_id": seller_id,
 							"_primary_seller_url": final_seller_url,
 					}
-					all_records.append(combined)
-					
+					keyword_records.append(combined)
+			
 					# Track sellers for enrichment if they're missing URL, email, or phone (and not Walmart)
 					# IMPORTANT: seller_profile API accepts BOTH numeric seller IDs AND seller URLs
 					# So we can enrich sellers even if we only have UUID seller IDs (use seller URL instead)
@@ -1013,57 +1099,129 @@ def run(keyword_list: List[str], max_per_keyword: int, export: List[str], sleep:
 							needs_enrichment = True  # Missing URL
 						if not combined.get("email_address") and not combined.get("phone_number"):
 							needs_enrichment = True  # Missing contact info
-						
+				
 						# Add to pending if we have either:
 						# 1. Numeric seller ID (preferred)
 						# 2. Seller URL (works even with UUID seller IDs!)
 						if needs_enrichment:
-							if seller_id and _is_numeric_string(str(seller_id)):
-								# Use numeric seller ID (best option)
-								pending_sellers.append((str(seller_id), final_seller_url))
-							elif final_seller_url:
-								# Use seller URL (works even if seller_id is UUID!)
-								# Pass None for seller_id, URL for url parameter
-								pending_sellers.append((None, final_seller_url))
+							seller_key = _seller_key(seller_id, final_seller_url)
+							if seller_key:
+								pending_sellers.setdefault(seller_key, final_seller_url)
 					collected += 1
 					items_added_this_page += 1
 					# Show progress every 5 items or on first item
 					if collected % 5 == 0 or collected == 1:
 						max_display = max_per_keyword if max_per_keyword > 0 else "unlimited"
-						print(f"[{_ts()}]   Collected {collected}/{max_display} items for '{kw}'", flush=True)
-				
-				# If we got 0 new items this page (all duplicates), stop pagination
-				if items_added_this_page == 0 and page > 1:
-					print(f"[{_ts()}]   No new items on page {page} (all duplicates); stopping pagination", flush=True)
-					break
-				
-				page += 1
-			print(f"[{_ts()}] Keyword done: {kw} | collected={collected} items total", flush=True)
+						_kw_print(kw, f"  Collected {collected}/{max_display} items for '{kw}'")
+			db.write_page(page_summaries, page_listing_snapshots, page_seller_snapshots)
+		
+			# If we got 0 new items this page (all duplicates), stop pagination
+			if items_added_this_page == 0 and page > 1:
+				_kw_print(kw, f"  No new items on page {page} (all duplicates); stopping pagination")
+				break
+		
+			page += 1
+	_kw_print(kw, f"Keyword done: {kw} | collected={collected} items total")
+	return keyword_records, keyword_offers, pending_sellers
+
+
+def run(keyword_list: List[str], max_per_keyword: int, export: List[str], sleep: float, offers_export: bool, max_pages: int, debug: bool, walmart_domain: Optional[str] = None, category_id: Optional[str] = None, retry_seller_passes: int = 0, retry_seller_delay: float = 15.0, keyword_workers: int = _MAX_KEYWORD_WORKERS, cache_ttl: int = 3600, seller_workers: int = _SELLER_WORKERS, cache_size: int = _API_CACHE_SIZE) -> None:
+	"""Main scraping function with export"""
+	# Raw API responses go to a single output/debug.jsonl stream in debug mode
+	debug_stream: Optional[DebugStream] = None
+	spool: Optional[RecordSpool] = None
+	offer_spool: Optional[RecordSpool] = None
+	try:
+		if debug:
+			debug_stream = DebugStream()
+		init_db()
+		cfg = get_config()
+		# Use custom domain if provided, otherwise use default from config
+		domain_to_use = walmart_domain or cfg.site
+		client = BlueCartClient(sleep_seconds=sleep, site=domain_to_use, cache_ttl_seconds=cache_ttl, cache_max_size=max(1, cache_size))
+		db = SnapshotWriter()
+		print(f"[{_ts()}] Start scan | domain={client.site} | keywords={len(keyword_list)} | max_per_keyword={max_per_keyword} | max_pages={max_pages} | export={export}", flush=True)
+
+		spool = RecordSpool("walmart_records")
+		total_records = 0
+		offer_spool = RecordSpool("walmart_offers")
+		# First offer per (listing_id, seller_name, price) wins; only the keys stay in memory
+		seen_offers: set = set()
+		# Cache and pending lists for seller retries
+		seller_cache: Dict[Tuple[Optional[str], Optional[str]], Dict[str, Any]] = {}  # Cache seller profiles to avoid duplicate API calls
+		# Unique seller keys to enrich, in first-seen order, each with the first seller URL seen for it;
+		# keys are _seller_key tuples, which also key seller_cache
+		pending_sellers: Dict[Tuple[Optional[str], Optional[str]], Optional[str]] = {}
+
+		# Keywords are independent and network-bound, so they are scanned on a thread pool.
+		# Results are merged in keyword order as they become available; the first failing
+		# keyword cancels the ones not yet started. SQLite writes go through one writer thread.
+		keywords = list(dict.fromkeys(keyword_list))
+		scan = partial(_scan_keyword, client=client, db=db, max_per_keyword=max_per_keyword, offers_export=offers_export, max_pages=max_pages, debug=debug, debug_stream=debug_stream, category_id=category_id, retry_seller_passes=retry_seller_passes)
+		scan_error: Optional[BaseException] = None
+		try:
+			with ThreadPoolExecutor(max_workers=max(1, min(keyword_workers, len(keywords)))) as ex:
+				futures = {ex.submit(scan, kw): i for i, kw in enumerate(keywords)}
+				finished: Dict[int, Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[Tuple[Optional[str], Optional[str]], Optional[str]]]] = {}
+				next_index = 0
+				for future in as_completed(futures):
+					try:
+						finished[futures[future]] = future.result()
+					except BaseException:
+						ex.shutdown(wait=False, cancel_futures=True)
+						raise
+					while next_index in finished:
+						records, offers, pending = finished.pop(next_index)
+						next_index += 1
+						total_records += len(records)
+						# (listing_id, keyword) is already unique here: keywords are deduplicated above and
+						# _scan_keyword skips listing_ids it has seen, so only empty rows are dropped.
+						# Kept records are spooled to disk, not held in memory
+						for r in records:
+							if r.get("listing_id") and r.get("listing_title"):
+								spool.append(r)
+						for r in offers:
+							listing_id = r.get("listing_id")
+							if listing_id:
+								key = (listing_id, r.get("seller_name"), r.get("price"))
+								if key not in seen_offers:
+									seen_offers.add(key)
+									offer_spool.append(r)
+						for seller_key, seller_url in pending.items():
+							pending_sellers.setdefault(seller_key, seller_url)
+		except BaseException as e:
+			scan_error = e
+			raise
+		finally:
+			try:
+				db.close()
+			except Exception as e:
+				# Don't mask the scan failure that is already propagating with the writer's. A failed
+				# write usually is that failure (the next enqueue raises it), so only report a different one
+				if scan_error is None:
+					raise
+				if e is not scan_error:
+					print(f"[{_ts()}] ⚠️ SQLite writer also failed: {type(e).__name__}: {e}", flush=True)
 
 		# Retry pass for seller_profile if requested (US only)
 		if retry_seller_passes > 0 and client.site == "walmart.com" and pending_sellers:
-			print(f"[{_ts()}] 🔄 Starting seller enrichment pass | pending sellers: {len(pending_sellers)}", flush=True)
-			# unique pending set
-			unique_pending: List[Tuple[Optional[str], Optional[str]]] = []
-			seen_keys: set = set()
-			for sid, surl in pending_sellers:
-				key = f"sid:{sid}" if sid else f"url:{surl}"
-				if key in seen_keys:
-					continue
-				seen_keys.add(key)
-				unique_pending.append((sid, surl))
-			print(f"[{_ts()}] 🔄 Unique sellers to enrich: {len(unique_pending)}", flush=True)
+			# (seller key, URL passed to seller_profile) pairs
+			unique_pending: List[Tuple[Tuple[Optional[str], Optional[str]], Optional[str]]] = list(pending_sellers.items())
+			print(f"[{_ts()}] 🔄 Starting seller enrichment pass | unique sellers to enrich: {len(unique_pending)}", flush=True)
 			# OPTIMIZATION: Use parallel seller enrichment for speed
-			from concurrent.futures import ThreadPoolExecutor, as_completed
-			max_workers = 5  # Parallel enrichment (5 concurrent API calls)
+			max_workers = max(1, seller_workers)  # Parallel enrichment; request rate is set by the pacer below
+			# Spreads each pass's seller_profile calls over retry_seller_delay seconds (None = unpaced)
+			pacer: Optional[_Pacer] = None
 			
-			def enrich_single_seller(seller_data: Tuple[int, Optional[str], Optional[str]]) -> Tuple[int, Optional[str], Optional[str], Optional[Dict[str, Any]]]:
+			def enrich_single_seller(seller_data: Tuple[int, Tuple[Optional[str], Optional[str]], Optional[str]]) -> Tuple[int, Tuple[Optional[str], Optional[str]], Optional[str], Optional[Dict[str, Any]]]:
 				"""Enrich a single seller - designed for parallel execution"""
-				idx, sid, surl = seller_data
-				key = f"sid:{sid}" if sid else f"url:{surl}"
+				idx, key, surl = seller_data
+				sid = key[0]
 				if key in seller_cache:
-					return (idx, sid, surl, None)  # Already cached
+					return (idx, key, surl, None)  # Already cached
 				try:
+					if pacer:
+						pacer.wait()
 					sp = client.seller_profile(seller_id=sid, url=surl)
 					# Check for API errors in response
 					if isinstance(sp, dict):
@@ -1073,30 +1231,30 @@ def run(keyword_list: List[str], max_per_keyword: int, export: List[str], sleep:
 							status = request_info.get("status", "")
 							if status and status != "success":
 								if debug:
-									print(f"[{_ts()}]   ⚠️ API warning for seller {idx}: {msg}", flush=True)
+									print(f"[{_ts()}]   ⚠️ API warning for seller {idx}: {msg}")
 					fields = _extract_seller_fields(sp)
 					# Cache seller data if we got any useful fields (email, phone, URL, etc.)
 					if fields.get("email_address") or fields.get("phone_number") or fields.get("seller_profile_url"):
-						return (idx, sid, surl, fields)
+						return (idx, key, surl, fields)
 					else:
-						return (idx, sid, surl, None)  # No useful data
+						return (idx, key, surl, None)  # No useful data
 				except Exception as e:
 					if debug:
 						error_type = type(e).__name__
-						print(f"[{_ts()}]   ⚠️ Error enriching seller {idx} ({sid or surl[:30] if surl else 'N/A'}): {error_type}", flush=True)
-					return (idx, sid, surl, None)  # Error - return None
+						print(f"[{_ts()}]   ⚠️ Error enriching seller {idx} ({sid or surl[:30] if surl else 'N/A'}): {error_type}")
+					return (idx, key, surl, None)  # Error - return None
 			
 			for attempt in range(retry_seller_passes):
 				print(f"[{_ts()}] 🔄 Seller enrichment pass {attempt+1}/{retry_seller_passes} | processing {len(unique_pending)} sellers (parallel: {max_workers} workers)", flush=True)
-				still_pending: List[Tuple[Optional[str], Optional[str]]] = []
+				still_pending: List[Tuple[Tuple[Optional[str], Optional[str]], Optional[str]]] = []
 				enriched_count = 0
 				
 				# Prepare seller data with indices for tracking
-				seller_data_list = [(idx, sid, surl) for idx, (sid, surl) in enumerate(unique_pending, 1)]
+				seller_data_list = [(idx, key, surl) for idx, (key, surl) in enumerate(unique_pending, 1)]
 				
 				# Filter out already cached sellers
-				sellers_to_enrich = [(idx, sid, surl) for idx, sid, surl in seller_data_list 
-									 if (f"sid:{sid}" if sid else f"url:{surl}") not in seller_cache]
+				sellers_to_enrich = [(idx, key, surl) for idx, key, surl in seller_data_list 
+									 if key not in seller_cache]
 				
 				if not sellers_to_enrich:
 					print(f"[{_ts()}]   ✅ All sellers already cached - skipping enrichment", flush=True)
@@ -1104,13 +1262,13 @@ def run(keyword_list: List[str], max_per_keyword: int, export: List[str], sleep:
 				
 				# Parallel enrichment
 				completed = 0
+				pacer = _Pacer(retry_seller_delay / len(sellers_to_enrich)) if retry_seller_delay > 0 else None
 				with ThreadPoolExecutor(max_workers=max_workers) as executor:
 					future_to_seller = {executor.submit(enrich_single_seller, seller_data): seller_data for seller_data in sellers_to_enrich}
 					
 					for future in as_completed(future_to_seller):
 						completed += 1
-						idx, sid, surl, fields = future.result()
-						key = f"sid:{sid}" if sid else f"url:{surl}"
+						idx, key, surl, fields = future.result()
 						
 						if fields:
 							seller_cache[key] = fields
@@ -1118,11 +1276,7 @@ def run(keyword_list: List[str], max_per_keyword: int, export: List[str], sleep:
 							if completed % 5 == 0 or completed == len(sellers_to_enrich):
 								print(f"[{_ts()}]   ✅ Enriched {completed}/{len(sellers_to_enrich)} sellers", flush=True)
 						else:
-							still_pending.append((sid, surl))
-						
-						# Small delay to avoid rate limiting (distributed across parallel calls)
-						if retry_seller_delay > 0 and completed < len(sellers_to_enrich):
-							time.sleep(retry_seller_delay / max_workers)
+							still_pending.append((key, surl))
 				
 				print(f"[{_ts()}] ✅ Pass {attempt+1} complete: enriched {enriched_count} sellers, {len(still_pending)} still pending", flush=True)
 				unique_pending = still_pending
@@ -1130,26 +1284,6 @@ def run(keyword_list: List[str], max_per_keyword: int, export: List[str], sleep:
 					print(f"[{_ts()}] ✅ All sellers enriched!", flush=True)
 					break
 			print(f"[{_ts()}] ✅ Seller enrichment complete", flush=True)
-			# Reconcile results into all_records - update with enriched seller data
-			for r in all_records:
-				key = None
-				sid = r.get("_primary_seller_id")
-				surl = r.get("_primary_seller_url")
-				if sid:
-					key = f"sid:{sid}"
-				elif surl:
-					key = f"url:{surl}"
-				if key and key in seller_cache:
-					fields = seller_cache[key]
-					# Update seller fields from enriched data
-					for k in ("email_address", "phone_number", "address", "country", "state_province", "zip_code", "seller_profile_picture", "seller_profile_url", "business_legal_name", "seller_rating", "total_reviews"):
-						if fields.get(k):
-							# Always update seller_profile_url if available from enrichment (it's more complete)
-							if k == "seller_profile_url" and fields.get(k):
-								r["seller_profile_url"] = fields[k]
-							# For other fields, only update if not already set
-							elif not r.get(k):
-								r[k] = fields[k]
 
 		# export - include keyword in filename if single keyword
 		if len(keyword_list) == 1:
@@ -1158,46 +1292,23 @@ def run(keyword_list: List[str], max_per_keyword: int, export: List[str], sleep:
 			name_prefix = f"walmart_scan_{safe_keyword}"
 		else:
 			name_prefix = "walmart_scan"
-		# Clean up records: drop empties and dedupe by (listing_id, keyword)
-		seen_keys: set = set()
-		cleaned_records: List[Dict[str, Any]] = []
-		for r in all_records:
-			listing_id = r.get("listing_id")
-			keyword = r.get("keyword")
-			if not listing_id or not r.get("listing_title"):
-				continue
-			# Deduplicate by (listing_id, keyword) - same product can appear in different keywords
-			key = (str(listing_id), str(keyword) if keyword else "")
-			if key in seen_keys:
-				continue
-			seen_keys.add(key)
-			# strip internal keys
-			r2 = {k: v for k, v in r.items() if not k.startswith("_")}
-			cleaned_records.append(r2)
-
-		seen_offers: set = set()
-		cleaned_offers: List[Dict[str, Any]] = []
-		for r in all_offers:
-			key = (r.get("listing_id"), r.get("seller_name"), r.get("price"))
-			if not r.get("listing_id"):
-				continue
-			if key in seen_offers:
-				continue
-			seen_offers.add(key)
-			cleaned_offers.append(r)
+		# Enriched seller fields are merged and internal keys stripped as records stream out of the spool
+		cleaned_records = spool.map(partial(_finalize_record, seller_cache=seller_cache))
+		cleaned_offers = offer_spool
 
 		print(f"[{_ts()}] ✅ Records cleaned: {len(cleaned_records)} total records ready for export")
 
 		# Verify we have records before attempting export
 		if not cleaned_records:
-			print(f"[{_ts()}] WARNING: No cleaned records to export. Total collected: {len(all_records)}")
+			print(f"[{_ts()}] WARNING: No cleaned records to export. Total collected: {total_records}")
 			return
 
+		enhanced = _get_enhanced_exporters()
 		if "json" in export:
-			if ENHANCED_EXPORTS_AVAILABLE:
+			if enhanced:
 				# Use enhanced exporters with integration format
 				domain = client.site if hasattr(client, 'site') else 'walmart.com'
-				json_path = export_json_enhanced(cleaned_records, name_prefix, domain)
+				json_path = enhanced.export_json_enhanced(cleaned_records, name_prefix, domain)
 				print(f"[{_ts()}] Enhanced JSON exported: {json_path}")
 			else:
 				json_path = export_json(cleaned_records, name_prefix)
@@ -1205,14 +1316,15 @@ def run(keyword_list: List[str], max_per_keyword: int, export: List[str], sleep:
 		if "csv" in export:
 			try:
 				print(f"[{_ts()}] Starting CSV export for {len(cleaned_records)} records...")
-				if ENHANCED_EXPORTS_AVAILABLE:
+				if enhanced:
 					# Use enhanced exporters with integration format
 					domain = client.site if hasattr(client, 'site') else 'walmart.com'
 					print(f"[{_ts()}] Using enhanced CSV exporter with domain: {domain}")
-					csv_path = export_csv_enhanced(cleaned_records, name_prefix, domain=domain)
+					csv_path = enhanced.export_csv_enhanced(cleaned_records, name_prefix, domain=domain)
 					print(f"[{_ts()}] ✅ Enhanced CSV exported: {csv_path}")
 				else:
 					print(f"[{_ts()}] Using standard CSV exporter")
+					# Header is the union of every record's keys (seller enrichment adds some), so the spool is read twice
 					csv_path = export_csv(cleaned_records, name_prefix)
 					print(f"[{_ts()}] ✅ CSV exported: {csv_path}")
 			except Exception as e:
@@ -1234,6 +1346,14 @@ def run(keyword_list: List[str], max_per_keyword: int, export: List[str], sleep:
 		import traceback
 		traceback.print_exc()
 		raise
+	finally:
+		# Spools are falsy while empty (they have a __len__), so test for None
+		if debug_stream:
+			debug_stream.close()
+		if spool is not None:
+			spool.close()
+		if offer_spool is not None:
+			offer_spool.close()
 
 
 def main(args=None):
@@ -1245,25 +1365,31 @@ def main(args=None):
 	parser.add_argument("--export", nargs="+", default=["json", "csv"], choices=["json", "csv"])
 	parser.add_argument("--offers-export", action="store_true", help="Export per-offer dataset in addition to listings")
 	parser.add_argument("--max-pages", type=int, default=50, help="Max pages to paginate for search (0 or negative = unlimited)")
-	parser.add_argument("--debug", action="store_true", help="Write raw API responses to output/debug files for troubleshooting")
+	parser.add_argument("--debug", action="store_true", help="Append raw API responses to output/debug.jsonl (one JSON line per response) for troubleshooting")
 	parser.add_argument("--walmart-domain", type=str, default="", help="Walmart domain (e.g., walmart.com, walmart.ca, walmart.com.mx)")
 	parser.add_argument("--category-id", type=str, default="", help="Walmart category id to filter search")
 	parser.add_argument("--retry-seller-passes", type=int, default=0, help="Retry passes for seller_profile after crawl")
 	parser.add_argument("--retry-seller-delay", type=float, default=15.0, help="Seconds to distribute across each retry pass")
+	parser.add_argument("--cache-ttl", type=int, default=3600, help="Seconds a cached API response (e.g. a product seen under several keywords) stays reusable")
+	parser.add_argument("--cache-size", type=int, default=_API_CACHE_SIZE, help="Max API responses kept in the in-memory cache (search, product, offers and seller_profile share it)")
+	parser.add_argument("--seller-workers", type=int, default=_SELLER_WORKERS, help="Concurrent seller_profile calls in the retry pass")
+	parser.add_argument("--keyword-workers", type=int, default=_MAX_KEYWORD_WORKERS, help="Keywords crawled concurrently (1 = one at a time)")
 	args = parser.parse_args(args)
 
 	keywords: List[str] = []
 	if args.keywords:
-		keywords.extend([s.strip() for s in args.keywords.split(",") if s.strip()])
+		keywords.extend(s for s in map(str.strip, args.keywords.split(",")) if s)
 	if args.keywords_file:
-		with open(args.keywords_file, "r", encoding="utf-8") as f:
-			keywords.extend([line.strip() for line in f if line.strip()])
+		text = Path(args.keywords_file).read_text(encoding="utf-8")
+		keywords.extend(s for s in map(str.strip, text.splitlines()) if s)
+	# Repeated keywords would only re-crawl the same results; keep first occurrences in order
+	keywords = list(dict.fromkeys(keywords))
 	if not keywords:
 		raise SystemExit("No keywords provided. Use --keywords or --keywords-file")
 
 	walmart_domain = args.walmart_domain.strip() or None
 	category_id = args.category_id.strip() or None
-	run(keywords, args.max_per_keyword, args.export, args.sleep, args.offers_export, args.max_pages, args.debug, walmart_domain, category_id, args.retry_seller_passes, args.retry_seller_delay)
+	run(keywords, args.max_per_keyword, args.export, args.sleep, args.offers_export, args.max_pages, args.debug, walmart_domain, category_id, args.retry_seller_passes, args.retry_seller_delay, args.keyword_workers, args.cache_ttl, args.seller_workers, args.cache_size)
 
 
 if __name__ == "__main__":
@@ -16,8 +16,9 @@ import json
 import os
 import sys
 import time
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import aiohttp
 
@@ -29,6 +30,10 @@ from config import get_config
 from exporters import export_csv, export_json, ensure_output_dir
 from storage import init_db, upsert_listing_summary, insert_listing_snapshot, insert_seller_snapshot
 
+# Default number of items crawled at once; the client's connection pool and the worker pool its
+# blocking calls run on are sized to match
+_MAX_CONCURRENT = 10
+
 
 def _safe_get(data: Dict[str, Any], *keys: str, default: Any = None) -> Any:
     """Safely get nested dictionary values."""
@@ -40,6 +45,16 @@ def _safe_get(data: Dict[str, Any], *keys: str, default: Any = None) -> Any:
     return data
 
 
+def _getter(data: Any) -> Callable[..., Any]:
+    """Bound .get for flat lookups on a known-shape node; a non-dict node yields every default, like _safe_get."""
+    return data.get if isinstance(data, dict) else {}.get
+
+
+async def _in_thread(executor: Optional[Executor], fn: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking client call on the given executor without blocking the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+
 def _is_numeric_string(s: str) -> bool:
     """Check if string is numeric."""
     try:
@@ -70,40 +85,43 @@ def _collect_numeric_seller_id(data: Dict[str, Any]) -> Optional[str]:
 
 def normalize_listing_from_product(product_data: Dict[str, Any], item_id: str) -> Dict[str, Any]:
     """Normalize product data from BlueCart product API response."""
+    get = _getter(product_data)
     return {
         "listing_id": item_id,
-        "listing_title": _safe_get(product_data, "title", default=""),
-        "brand": _safe_get(product_data, "brand", default=""),
-        "listing_url": _safe_get(product_data, "link", default=f"https://www.walmart.com/ip/{item_id}"),
-        "price": _safe_get(product_data, "price", default=""),
-        "currency": _safe_get(product_data, "currency", default="USD"),
-        "in_stock": _safe_get(product_data, "in_stock", default=True),
-        "product_sku": _safe_get(product_data, "model", default=""),
-        "full_product_description": _safe_get(product_data, "description_full", default=_safe_get(product_data, "description", default="")),
-        "product_images": json.dumps(_safe_get(product_data, "images", default=[])),
-        "total_reviews": _safe_get(product_data, "ratings_total", default=0),
-        "rating": _safe_get(product_data, "rating", default=0),
-        "item_number": _safe_get(product_data, "item_number", default=""),
-        "upc": _safe_get(product_data, "upc", default=""),
-        "product_id": _safe_get(product_data, "product_id", default=""),
+        "listing_title": get("title", ""),
+        "brand": get("brand", ""),
+        "listing_url": get("link", f"https://www.walmart.com/ip/{item_id}"),
+        "price": get("price", ""),
+        "currency": get("currency", "USD"),
+        "in_stock": get("in_stock", True),
+        "product_sku": get("model", ""),
+        "full_product_description": get("description_full", get("description", "")),
+        "product_images": json.dumps(get("images", [])),
+        "total_reviews": get("ratings_total", 0),
+        "rating": get("rating", 0),
+        "item_number": get("item_number", ""),
+        "upc": get("upc", ""),
+        "product_id": get("product_id", ""),
     }
 
 
 def normalize_offer(offer_data: Dict[str, Any]) -> Dict[str, Any]:
     """Normalize offer data from BlueCart API response."""
+    get = _getter(offer_data)
     return {
-        "seller_id": _safe_get(offer_data, "seller_id", default=""),
-        "seller_name": _safe_get(offer_data, "seller_name", default=""),
-        "seller_profile_url": _safe_get(offer_data, "seller_url", default=""),
-        "price": _safe_get(offer_data, "price", default=""),
-        "currency": _safe_get(offer_data, "currency", default="USD"),
-        "shipping": _safe_get(offer_data, "shipping", default=""),
-        "availability": _safe_get(offer_data, "availability", default=""),
+        "seller_id": get("seller_id", ""),
+        "seller_name": get("seller_name", ""),
+        "seller_profile_url": get("seller_url", ""),
+        "price": get("price", ""),
+        "currency": get("currency", "USD"),
+        "shipping": get("shipping", ""),
+        "availability": get("availability", ""),
     }
 
 
 async def enrich_seller_data(session: aiohttp.ClientSession, client: BlueCartClient, 
-                           seller_id: str, seller_url: str, listing_id: str) -> Dict[str, Any]:
+                           seller_id: str, seller_url: str, listing_id: str,
+                           executor: Optional[Executor] = None) -> Dict[str, Any]:
     """Enrich seller data using BlueCart seller profile API."""
     enriched = {
         "seller_id": seller_id,
@@ -125,22 +143,22 @@ async def enrich_seller_data(session: aiohttp.ClientSession, client: BlueCartCli
     
     try:
         # Try BlueCart seller profile API
-        seller_data = client.seller_profile(seller_id=seller_id, url=seller_url)
+        seller_data = await _in_thread(executor, client.seller_profile, seller_id, seller_url)
         
         if seller_data and "seller" in seller_data:
-            seller = seller_data["seller"]
+            get = _getter(seller_data["seller"])
             enriched.update({
-                "seller_name": _safe_get(seller, "name", default=""),
-                "business_legal_name": _safe_get(seller, "business_name", default=""),
-                "email_address": _safe_get(seller, "email", default=""),
-                "phone_number": _safe_get(seller, "phone", default=""),
-                "address": _safe_get(seller, "address", default=""),
-                "country": _safe_get(seller, "country", default=""),
-                "state_province": _safe_get(seller, "state", default=""),
-                "zip_code": _safe_get(seller, "zip", default=""),
-                "seller_rating": _safe_get(seller, "rating", default=0),
-                "seller_profile_picture": _safe_get(seller, "profile_picture", default=""),
-                "total_reviews_seller": _safe_get(seller, "total_reviews", default=0),
+                "seller_name": get("name", ""),
+                "business_legal_name": get("business_name", ""),
+                "email_address": get("email", ""),
+                "phone_number": get("phone", ""),
+                "address": get("address", ""),
+                "country": get("country", ""),
+                "state_province": get("state", ""),
+                "zip_code": get("zip", ""),
+                "seller_rating": get("rating", 0),
+                "seller_profile_picture": get("profile_picture", ""),
+                "total_reviews_seller": get("total_reviews", 0),
             })
             
             # Store seller snapshot
@@ -155,13 +173,15 @@ async def enrich_seller_data(session: aiohttp.ClientSession, client: BlueCartCli
 
 
 async def process_item_id(session: aiohttp.ClientSession, client: BlueCartClient, 
-                         item_id: str, debug: bool = False) -> Optional[Dict[str, Any]]:
+                         item_id: str, debug: bool = False,
+                         executor: Optional[Executor] = None) -> Optional[Dict[str, Any]]:
     """Process a single Walmart item ID and extract all available data."""
     print(f"🔍 Processing item ID: {item_id}")
     
     try:
-        # Get product details
-        product_response = client.product(item_id)
+        # Get product details (BlueCartClient is blocking, so its calls run on a worker thread
+        # and the event loop stays free)
+        product_response = await _in_thread(executor, client.product, item_id)
         
         if debug:
             debug_file = f"debug_product_{item_id}.json"
@@ -189,7 +209,7 @@ async def process_item_id(session: aiohttp.ClientSession, client: BlueCartClient
         # Get offers data (if supported)
         offers_data = []
         try:
-            offers_response = client.offers(item_id)
+            offers_response = await _in_thread(executor, client.offers, item_id)
             offers_data = _safe_get(offers_response, "offers", default=[])
             
             if debug:
@@ -213,14 +233,14 @@ async def process_item_id(session: aiohttp.ClientSession, client: BlueCartClient
         enriched_seller = {}
         if seller_id and _is_numeric_string(seller_id):
             enriched_seller = await enrich_seller_data(
-                session, client, seller_id, seller_url, item_id
+                session, client, seller_id, seller_url, item_id, executor
             )
         else:
             # Try to find seller ID in product data
             numeric_seller_id = _collect_numeric_seller_id(product_response)
             if numeric_seller_id:
                 enriched_seller = await enrich_seller_data(
-                    session, client, numeric_seller_id, seller_url, item_id
+                    session, client, numeric_seller_id, seller_url, item_id, executor
                 )
             else:
                 # If no seller ID found, create basic seller info from product data
@@ -261,10 +281,12 @@ async def process_item_id(session: aiohttp.ClientSession, client: BlueCartClient
 
 
 async def run_id_crawler(item_ids: List[str], export_formats: List[str], 
-                        debug: bool = False, sleep: float = 0.5) -> List[Dict[str, Any]]:
-    """Run the ID crawler for multiple item IDs."""
+                        debug: bool = False, sleep: float = 0.5,
+                        max_concurrent: int = _MAX_CONCURRENT) -> List[Dict[str, Any]]:
+    """Run the ID crawler for multiple item IDs, up to max_concurrent at a time."""
     config = get_config()
-    client = BlueCartClient(sleep_seconds=sleep)
+    max_concurrent = max(1, max_concurrent)
+    client = BlueCartClient(sleep_seconds=sleep, max_in_flight=max_concurrent)
     
     # Initialize database
     init_db()
@@ -272,19 +294,24 @@ async def run_id_crawler(item_ids: List[str], export_formats: List[str],
     # Ensure output directory exists
     ensure_output_dir()
     
-    results = []
+    semaphore = asyncio.Semaphore(max_concurrent)
     
     async with aiohttp.ClientSession() as session:
-        for i, item_id in enumerate(item_ids, 1):
-            print(f"\n📦 Processing {i}/{len(item_ids)}: {item_id}")
-            
-            result = await process_item_id(session, client, item_id, debug)
-            if result:
-                results.append(result)
+        with ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="bluecart") as executor:
+            async def process_with_semaphore(i: int, item_id: str) -> Optional[Dict[str, Any]]:
+                async with semaphore:
+                    print(f"\n📦 Processing {i}/{len(item_ids)}: {item_id}")
+                    result = await process_item_id(session, client, item_id, debug, executor)
+                    
+                    # Sleep between requests to be respectful; each slot pauses before its next item
+                    if i < len(item_ids):
+                        await asyncio.sleep(sleep)
+                    return result
             
-            # Sleep between requests to be respectful
-            if i < len(item_ids):
-                await asyncio.sleep(sleep)
+            # gather() keeps input order, so results come out in item-id order
+            outcomes = await asyncio.gather(*(process_with_semaphore(i, item_id) for i, item_id in enumerate(item_ids, 1)))
+    
+    results = [r for r in outcomes if r]
     
     # Export results
     if results:
@@ -312,6 +339,7 @@ def main():
                        default=["csv"], help="Export formats")
     parser.add_argument("--debug", action="store_true", help="Save debug JSON files")
     parser.add_argument("--sleep", type=float, default=0.5, help="Sleep between requests (seconds)")
+    parser.add_argument("--max-concurrent", type=int, default=_MAX_CONCURRENT, help="Maximum items crawled at once")
     
     args = parser.parse_args()
     
@@ -338,11 +366,12 @@ def main():
     print(f"📋 Item IDs to process: {len(item_ids)}")
     print(f"📤 Export formats: {', '.join(args.export)}")
     print(f"⏱️  Sleep between requests: {args.sleep}s")
+    print(f"🔄 Max concurrent: {args.max_concurrent}")
     
     start_time = time.time()
     
     # Run the crawler
-    results = asyncio.run(run_id_crawler(item_ids, args.export, args.debug, args.sleep))
+    results = asyncio.run(run_id_crawler(item_ids, args.export, args.debug, args.sleep, args.max_concurrent))
     
     end_time = time.time()
     duration = end_time - start_time
@@ -8,21 +8,27 @@ import asyncio
 import aiohttp
 import json
 import time
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 import argparse
 import os
 
 from bluecart_client import BlueCartClient
 from config import get_config
-from storage import insert_listing_snapshot, insert_seller_snapshot
+from storage import insert_listing_snapshots_many, insert_seller_snapshots_many
 from exporters import export_csv, export_json
 
-# Global seller cache for performance
-SELLER_CACHE = {}
+# Global seller cache for performance: finished seller lookups only. Lookups still in flight live in a
+# per-run dict (see run_fast_id_crawler), since an asyncio task belongs to the loop of the run that made it
+SELLER_CACHE: Dict[str, Dict[str, Any]] = {}
 CACHE_HITS = 0
 CACHE_MISSES = 0
 
+async def _in_thread(executor: Optional[Executor], fn: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking client call on the given executor without blocking the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
 def _safe_get(data: Dict[str, Any], key: str, default: Any = None) -> Any:
     """Safely get a value from a dictionary."""
     try:
@@ -30,6 +36,10 @@ def _safe_get(data: Dict[str, Any], key: str, default: Any = None) -> Any:
     except (KeyError, TypeError):
         return default
 
+def _getter(data: Any) -> Callable[..., Any]:
+    """Bound .get for flat lookups on a known-shape node; a non-dict node yields every default."""
+    return data.get if isinstance(data, dict) else {}.get
+
 def _is_numeric_string(value: Any) -> bool:
     """Check if a value is a numeric string."""
     if not isinstance(value, str):
@@ -42,22 +52,23 @@ def _is_numeric_string(value: Any) -> bool:
 
 def normalize_listing_from_product(product_data: Dict[str, Any], item_id: str) -> Dict[str, Any]:
     """Normalize product data from BlueCart product API response."""
+    get = _getter(product_data)
     return {
         "listing_id": item_id,
-        "listing_title": _safe_get(product_data, "title", default=""),
-        "brand": _safe_get(product_data, "brand", default=""),
-        "listing_url": _safe_get(product_data, "link", default=f"https://www.walmart.com/ip/{item_id}"),
-        "price": _safe_get(product_data, "price", default=""),
-        "currency": _safe_get(product_data, "currency", default="USD"),
-        "in_stock": _safe_get(product_data, "in_stock", default=True),
-        "product_sku": _safe_get(product_data, "model", default=""),
-        "full_product_description": _safe_get(product_data, "description_full", default=_safe_get(product_data, "description", default="")),
-        "product_images": json.dumps(_safe_get(product_data, "images", default=[])),
-        "total_reviews": _safe_get(product_data, "ratings_total", default=0),
-        "rating": _safe_get(product_data, "rating", default=0),
-        "item_number": _safe_get(product_data, "item_number", default=""),
-        "upc": _safe_get(product_data, "upc", default=""),
-        "product_id": _safe_get(product_data, "product_id", default=""),
+        "listing_title": get("title", ""),
+        "brand": get("brand", ""),
+        "listing_url": get("link", f"https://www.walmart.com/ip/{item_id}"),
+        "price": get("price", ""),
+        "currency": get("currency", "USD"),
+        "in_stock": get("in_stock", True),
+        "product_sku": get("model", ""),
+        "full_product_description": get("description_full", get("description", "")),
+        "product_images": json.dumps(get("images", [])),
+        "total_reviews": get("ratings_total", 0),
+        "rating": get("rating", 0),
+        "item_number": get("item_number", ""),
+        "upc": get("upc", ""),
+        "product_id": get("product_id", ""),
     }
 
 def _collect_numeric_seller_id(product_data: Dict[str, Any]) -> Optional[str]:
@@ -79,10 +90,16 @@ async def enrich_seller_data_cached(
     client: BlueCartClient,
     seller_id: str,
     seller_url: str,
-    item_id: str
+    item_id: str,
+    in_flight: Dict[str, "asyncio.Task[Dict[str, Any]]"],
+    executor: Optional[Executor] = None
 ) -> Dict[str, Any]:
-    """Enrich seller data with caching."""
-    global SELLER_CACHE, CACHE_HITS, CACHE_MISSES
+    """Enrich seller data with caching; falls back to basic Walmart info on error.
+
+    Items that hit a seller while it is still being fetched await the same task from
+    in_flight instead of refetching it.
+    """
+    global CACHE_HITS, CACHE_MISSES
     
     cache_key = f"{seller_id}_{seller_url}"
     if cache_key in SELLER_CACHE:
@@ -90,70 +107,99 @@ async def enrich_seller_data_cached(
         print(f"🎯 Cache HIT for seller {seller_id}")
         return SELLER_CACHE[cache_key]
     
-    CACHE_MISSES += 1
-    print(f"🔍 Cache MISS for seller {seller_id} - fetching...")
-    
-    try:
-        seller_profile = client.seller_profile(seller_id, seller_url)
-        
-        enriched_seller = {
-            "seller_id": seller_id,
-            "seller_name": _safe_get(seller_profile, "name", default=""),
-            "seller_profile_url": seller_url,
-            "seller_profile_picture": _safe_get(seller_profile, "profile_picture", default=""),
-            "seller_rating": _safe_get(seller_profile, "rating", default=0),
-            "total_reviews_seller": _safe_get(seller_profile, "total_reviews", default=0),
-            "email_address": _safe_get(seller_profile, "email", default=""),
-            "phone_number": _safe_get(seller_profile, "phone", default=""),
-            "address": _safe_get(seller_profile, "address", default=""),
-            "business_legal_name": _safe_get(seller_profile, "business_name", default=""),
-            "country": _safe_get(seller_profile, "country", default=""),
-            "state_province": _safe_get(seller_profile, "state", default=""),
-            "zip_code": _safe_get(seller_profile, "zip", default=""),
-            "data_source": "seller_profile_api",
-            "enrichment_status": "enriched"
-        }
+    task = in_flight.get(cache_key)
+    if task is not None:
+        CACHE_HITS += 1
+        print(f"🎯 Cache HIT for seller {seller_id} (in flight)")
+    else:
+        CACHE_MISSES += 1
+        print(f"🔍 Cache MISS for seller {seller_id} - fetching...")
+        task = in_flight[cache_key] = asyncio.ensure_future(_fetch_seller(client, seller_id, seller_url, executor))
         
-        SELLER_CACHE[cache_key] = enriched_seller
-        print(f"✅ Seller {seller_id} enriched and cached")
-        return enriched_seller
+        def _settle(done: "asyncio.Task[Dict[str, Any]]") -> None:
+            # A cancelled or failed lookup is dropped so the next item for this seller fetches it again
+            in_flight.pop(cache_key, None)
+            if not done.cancelled() and done.exception() is None:
+                SELLER_CACHE[cache_key] = done.result()
         
+        task.add_done_callback(_settle)
+    
+    try:
+        return await task
     except Exception as e:
+        # The fallback is never cached, so one transient error doesn't cost the seller its enrichment for good
         print(f"⚠️  Failed to enrich seller {seller_id}: {e}")
-        fallback_data = {
-            "seller_id": seller_id,
-            "seller_name": "Walmart",
-            "seller_profile_url": seller_url,
-            "seller_profile_picture": "",
-            "seller_rating": 0,
-            "total_reviews_seller": 0,
-            "email_address": "",
-            "phone_number": "",
-            "address": "",
-            "business_legal_name": "Walmart Inc.",
-            "country": "US",
-            "state_province": "",
-            "zip_code": "",
-            "data_source": "fallback",
-            "enrichment_status": "basic"
-        }
-        
-        SELLER_CACHE[cache_key] = fallback_data
-        return fallback_data
+        return _fallback_seller(seller_id, seller_url)
+
+async def _fetch_seller(
+    client: BlueCartClient,
+    seller_id: str,
+    seller_url: str,
+    executor: Optional[Executor] = None
+) -> Dict[str, Any]:
+    """Fetch and normalize one seller profile."""
+    seller_profile = await _in_thread(executor, client.seller_profile, seller_id, seller_url)
+    
+    get = _getter(seller_profile)
+    enriched_seller = {
+        "seller_id": seller_id,
+        "seller_name": get("name", ""),
+        "seller_profile_url": seller_url,
+        "seller_profile_picture": get("profile_picture", ""),
+        "seller_rating": get("rating", 0),
+        "total_reviews_seller": get("total_reviews", 0),
+        "email_address": get("email", ""),
+        "phone_number": get("phone", ""),
+        "address": get("address", ""),
+        "business_legal_name": get("business_name", ""),
+        "country": get("country", ""),
+        "state_province": get("state", ""),
+        "zip_code": get("zip", ""),
+        "data_source": "seller_profile_api",
+        "enrichment_status": "enriched"
+    }
+    
+    print(f"✅ Seller {seller_id} enriched and cached")
+    return enriched_seller
+
+def _fallback_seller(seller_id: str, seller_url: str) -> Dict[str, Any]:
+    """Basic Walmart seller info for a seller whose profile could not be fetched."""
+    return {
+        "seller_id": seller_id,
+        "seller_name": "Walmart",
+        "seller_profile_url": seller_url,
+        "seller_profile_picture": "",
+        "seller_rating": 0,
+        "total_reviews_seller": 0,
+        "email_address": "",
+        "phone_number": "",
+        "address": "",
+        "business_legal_name": "Walmart Inc.",
+        "country": "US",
+        "state_province": "",
+        "zip_code": "",
+        "data_source": "fallback",
+        "enrichment_status": "basic"
+    }
 
 async def process_item_id_fast(
     session: aiohttp.ClientSession,
     client: BlueCartClient,
     item_id: str,
     skip_seller_enrichment: bool = False,
-    sleep: float = 0.05
+    sleep: float = 0.05,
+    executor: Optional[Executor] = None,
+    in_flight: Optional[Dict[str, "asyncio.Task[Dict[str, Any]]"]] = None
 ) -> Optional[Dict[str, Any]]:
     """Process a single item ID with optimized performance."""
+    if in_flight is None:
+        in_flight = {}
     try:
         print(f"🔄 Processing item ID: {item_id}")
         
-        # Get product data
-        product_response = client.product(item_id)
+        # Get product data. BlueCartClient is blocking and thread-safe, so its calls run on
+        # worker threads; otherwise each call would stall the loop and gather() would run items one by one
+        product_response = await _in_thread(executor, client.product, item_id)
         if not product_response:
             print(f"❌ No product data for {item_id}")
             return None
@@ -164,7 +210,7 @@ async def process_item_id_fast(
         # Get offers data (with fallback)
         offers_data = []
         try:
-            offers_response = client.offers(item_id)
+            offers_response = await _in_thread(executor, client.offers, item_id)
             offers_data = _safe_get(offers_response, "offers", default=[])
         except Exception as e:
             print(f"⚠️  Offers API not supported or failed: {e}")
@@ -200,14 +246,14 @@ async def process_item_id_fast(
             }
         elif seller_id and _is_numeric_string(seller_id):
             enriched_seller = await enrich_seller_data_cached(
-                session, client, seller_id, seller_url, item_id
+                session, client, seller_id, seller_url, item_id, in_flight, executor
             )
         else:
             # Try to find seller ID in product data
             numeric_seller_id = _collect_numeric_seller_id(product_response)
             if numeric_seller_id:
                 enriched_seller = await enrich_seller_data_cached(
-                    session, client, numeric_seller_id, seller_url, item_id
+                    session, client, numeric_seller_id, seller_url, item_id, in_flight, executor
                 )
             else:
                 enriched_seller = {
@@ -244,6 +290,27 @@ async def process_item_id_fast(
         print(f"❌ Error processing item {item_id}: {e}")
         return None
 
+def _store_snapshots(table: str, write_many: Callable[[List[tuple]], None], rows: List[tuple], total: int) -> None:
+    """Write rows in one batch; if the batch fails, retry row by row so one bad row only loses itself.
+
+    Each *_many call is its own transaction and rolls back on error, so a failed batch stores
+    nothing and the retry cannot write any row twice.
+    """
+    try:
+        write_many(rows)
+        stored = len(rows)
+    except Exception as e:
+        print(f"⚠️  Database error writing {table} snapshots as a batch ({e}); retrying row by row")
+        stored = 0
+        for row in rows:
+            try:
+                write_many([row])
+                stored += 1
+            except Exception as e:
+                print(f"⚠️  Database error: {e}")
+    if stored < total:
+        print(f"⚠️  {total - stored}/{total} {table} snapshots not stored")
+
 async def run_fast_id_crawler(
     item_ids: List[str],
     export_formats: List[str] = ["csv"],
@@ -274,7 +341,9 @@ async def run_fast_id_crawler(
         timeout=timeout,
         headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
     ) as session:
-        client = BlueCartClient(config.api_key, config.base_url)
+        # One client (and so one pooled keep-alive Session) for the whole run, sized so every
+        # concurrent item gets a connection instead of queueing behind the default pool of 16
+        client = BlueCartClient(config.api_key, config.base_url, max_in_flight=max(1, max_concurrent))
         
         print(f"🚀 Starting FAST ID crawler for {len(item_ids)} items")
         print(f"⚡ Skip seller enrichment: {skip_seller_enrichment}")
@@ -285,15 +354,19 @@ async def run_fast_id_crawler(
         
         # Process items concurrently
         semaphore = asyncio.Semaphore(max_concurrent)
+        seller_lookups: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
         
-        async def process_with_semaphore(item_id: str):
-            async with semaphore:
-                return await process_item_id_fast(
-                    session, client, item_id, skip_seller_enrichment, sleep
-                )
-        
-        tasks = [process_with_semaphore(item_id) for item_id in item_ids]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Blocking client calls get their own pool of max_concurrent threads: the loop's default
+        # executor stops at min(32, cpu + 4) and is shared with whatever else runs on the loop
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrent), thread_name_prefix="bluecart") as executor:
+            async def process_with_semaphore(item_id: str):
+                async with semaphore:
+                    return await process_item_id_fast(
+                        session, client, item_id, skip_seller_enrichment, sleep, executor, seller_lookups
+                    )
+            
+            tasks = [process_with_semaphore(item_id) for item_id in item_ids]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Filter valid results
         valid_results = [r for r in results if r is not None and not isinstance(r, Exception)]
@@ -310,13 +383,12 @@ async def run_fast_id_crawler(
         if CACHE_HITS + CACHE_MISSES > 0:
             print(f"📈 Cache hit rate: {CACHE_HITS/(CACHE_HITS+CACHE_MISSES)*100:.1f}%")
         
-        # Store results in database
-        for result in valid_results:
-            try:
-                insert_listing_snapshot(result["listing_id"], result)
-                insert_seller_snapshot(result["listing_id"], result["seller_id"], result)
-            except Exception as e:
-                print(f"⚠️  Database error: {e}")
+        # Store results in database: one executemany transaction per table, not one commit per row.
+        # Each table is written independently, so a failure in one doesn't cost the other its rows
+        listing_rows = [(r.get("listing_id"), r) for r in valid_results if r.get("listing_id")]
+        seller_rows = [(lid, r.get("seller_id"), r) for lid, r in listing_rows if r.get("seller_id")]
+        _store_snapshots("listing", insert_listing_snapshots_many, listing_rows, len(valid_results))
+        _store_snapshots("seller", insert_seller_snapshots_many, seller_rows, len(valid_results))
         
         # Export results
         if valid_results:
@@ -1,6 +1,8 @@
 import json
 import os
+import queue
 import sqlite3
+import threading
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
@@ -8,6 +10,13 @@ from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from config import get_config
 
+# orjson encodes snapshot payloads in C; fall back to stdlib json when it is not installed
+try:
+	import orjson
+	ORJSON_AVAILABLE = True
+except ImportError:
+	ORJSON_AVAILABLE = False
+
 
 @dataclass
 class ListingSnapshot:
@@ -28,15 +37,35 @@ def _utc_now_iso() -> str:
 	return datetime.utcnow().replace(microsecond=0).isoformat() + "Z"
 
 
+def _dumps(data: Any) -> str:
+	"""Serialize a snapshot payload to JSON text for the data_json columns."""
+	if ORJSON_AVAILABLE:
+		try:
+			return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+		except TypeError:
+			# e.g. integers wider than 64 bits - let stdlib json handle the payload
+			pass
+	return json.dumps(data, ensure_ascii=False)
+
+
 @contextmanager
 def connect_db():
 	cfg = get_config()
 	conn = sqlite3.connect(cfg.database_path)
 	conn.execute("PRAGMA journal_mode=WAL;")
+	# WAL stays consistent with NORMAL sync; commits no longer wait on an fsync each
+	conn.execute("PRAGMA synchronous=NORMAL;")
+	# Keep temp b-trees in RAM and give the page cache 64 MiB (negative = KiB) for the upserts' index lookups
+	conn.execute("PRAGMA temp_store=MEMORY;")
+	conn.execute("PRAGMA cache_size=-65536;")
 	try:
 		yield conn
-	finally:
 		conn.commit()
+	except BaseException:
+		# a failed batch leaves nothing behind, so callers can retry its rows without duplicating any
+		conn.rollback()
+		raise
+	finally:
 		conn.close()
 
 
@@ -82,43 +111,162 @@ def init_db() -> None:
 		)
 
 
+_UPSERT_LISTING_SQL = """
+	INSERT INTO listings (listing_id, title, brand, url, last_seen_at)
+	VALUES (?, ?, ?, ?, ?)
+	ON CONFLICT(listing_id) DO UPDATE SET
+		title=excluded.title,
+		brand=excluded.brand,
+		url=excluded.url,
+		last_seen_at=excluded.last_seen_at
+"""
+
+_INSERT_LISTING_SNAPSHOT_SQL = """
+	INSERT INTO listing_history (listing_id, data_json, created_at)
+	VALUES (?, ?, ?)
+"""
+
+_INSERT_SELLER_SNAPSHOT_SQL = """
+	INSERT INTO seller_history (listing_id, seller_id, data_json, created_at)
+	VALUES (?, ?, ?, ?)
+"""
+
+
+def _summary_params(rows: Iterable[Tuple[str, Optional[str], Optional[str], Optional[str]]]) -> List[tuple]:
+	now = _utc_now_iso()
+	return [(listing_id, title, brand, url, now) for listing_id, title, brand, url in rows]
+
+
+def _listing_snapshot_params(rows: Iterable[Tuple[str, Dict[str, Any]]]) -> List[tuple]:
+	now = _utc_now_iso()
+	return [(listing_id, _dumps(data), now) for listing_id, data in rows]
+
+
+def _seller_snapshot_params(rows: Iterable[Tuple[str, str, Dict[str, Any]]]) -> List[tuple]:
+	now = _utc_now_iso()
+	return [(listing_id, seller_id, _dumps(data), now) for listing_id, seller_id, data in rows]
+
+
 def upsert_listing_summary(listing_id: str, title: Optional[str], brand: Optional[str], url: Optional[str]) -> None:
-	with connect_db() as conn:
-		conn.execute(
-			"""
-			INSERT INTO listings (listing_id, title, brand, url, last_seen_at)
-			VALUES (?, ?, ?, ?, ?)
-			ON CONFLICT(listing_id) DO UPDATE SET
-				title=excluded.title,
-				brand=excluded.brand,
-				url=excluded.url,
-				last_seen_at=excluded.last_seen_at
-			""",
-			(listing_id, title, brand, url, _utc_now_iso()),
-		)
+	upsert_listing_summaries_many([(listing_id, title, brand, url)])
 
 
 def insert_listing_snapshot(listing_id: str, data: Dict[str, Any]) -> None:
-	with connect_db() as conn:
-		conn.execute(
-			"""
-			INSERT INTO listing_history (listing_id, data_json, created_at)
-			VALUES (?, ?, ?)
-			""",
-			(listing_id, json.dumps(data, ensure_ascii=False), _utc_now_iso()),
-		)
+	insert_listing_snapshots_many([(listing_id, data)])
 
 
 def insert_seller_snapshot(listing_id: str, seller_id: str, data: Dict[str, Any]) -> None:
+	insert_seller_snapshots_many([(listing_id, seller_id, data)])
+
+
+def upsert_listing_summaries_many(rows: Iterable[Tuple[str, Optional[str], Optional[str], Optional[str]]]) -> None:
+	"""Upsert (listing_id, title, brand, url) rows in one transaction."""
 	with connect_db() as conn:
-		conn.execute(
-			"""
-			INSERT INTO seller_history (listing_id, seller_id, data_json, created_at)
-			VALUES (?, ?, ?, ?)
-			""",
-			(listing_id, seller_id, json.dumps(data, ensure_ascii=False), _utc_now_iso()),
+		conn.executemany(_UPSERT_LISTING_SQL, _summary_params(rows))
+
+
+def insert_listing_snapshots_many(rows: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+	"""Insert (listing_id, data) snapshot rows in one transaction."""
+	with connect_db() as conn:
+		conn.executemany(_INSERT_LISTING_SNAPSHOT_SQL, _listing_snapshot_params(rows))
+
+
+def insert_seller_snapshots_many(rows: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+	"""Insert (listing_id, seller_id, data) snapshot rows in one transaction."""
+	with connect_db() as conn:
+		conn.executemany(_INSERT_SELLER_SNAPSHOT_SQL, _seller_snapshot_params(rows))
+
+
+class SnapshotWriter:
+	"""Single background SQLite writer fed through a queue.
+
+	Mirrors the module-level write functions so scans running on several threads
+	can hand rows off without contending for the database. Each queued batch is
+	written with one executemany per statement, under a savepoint, so a batch that
+	fails leaves none of its rows behind. A write failure stops the writer and is
+	raised to the next caller that queues rows, so producers stop early instead of
+	queueing rows that will never be stored. Call close() to flush.
+	"""
+
+	def __init__(self):
+		self._queue: "queue.Queue[Optional[List[Tuple[str, List[tuple]]]]]" = queue.Queue()
+		self._error: Optional[BaseException] = None
+		self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+		self._thread.start()
+
+	def _run(self) -> None:
+		try:
+			with connect_db() as conn:
+				while True:
+					item = self._queue.get()
+					if item is None:
+						break
+					self._write(conn, item)
+					# commit whenever the producers are idle so rows show up while the scan runs
+					if self._queue.empty():
+						conn.commit()
+		except BaseException as e:
+			self._error = e
+			# keep draining so producers never block on a dead writer
+			while self._queue.get() is not None:
+				pass
+
+	@staticmethod
+	def _write(conn: sqlite3.Connection, batch: List[Tuple[str, List[tuple]]]) -> None:
+		if not conn.in_transaction:
+			conn.execute("BEGIN")
+		conn.execute("SAVEPOINT batch")
+		try:
+			for sql, params in batch:
+				conn.executemany(sql, params)
+		except BaseException:
+			conn.execute("ROLLBACK TO batch")
+			conn.execute("RELEASE batch")
+			# batches written before this one succeeded; keep them
+			conn.commit()
+			raise
+		conn.execute("RELEASE batch")
+
+	def _put(self, *statements: Tuple[str, List[tuple]]) -> None:
+		if self._error is not None:
+			raise self._error
+		batch = [(sql, params) for sql, params in statements if params]
+		if batch:
+			self._queue.put(batch)
+
+	def upsert_listing_summary(self, listing_id: str, title: Optional[str], brand: Optional[str], url: Optional[str]) -> None:
+		self.upsert_listing_summaries_many([(listing_id, title, brand, url)])
+
+	def insert_listing_snapshot(self, listing_id: str, data: Dict[str, Any]) -> None:
+		self.insert_listing_snapshots_many([(listing_id, data)])
+
+	def insert_seller_snapshot(self, listing_id: str, seller_id: str, data: Dict[str, Any]) -> None:
+		self.insert_seller_snapshots_many([(listing_id, seller_id, data)])
+
+	def upsert_listing_summaries_many(self, rows: Iterable[Tuple[str, Optional[str], Optional[str], Optional[str]]]) -> None:
+		self._put((_UPSERT_LISTING_SQL, _summary_params(rows)))
+
+	def insert_listing_snapshots_many(self, rows: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+		self._put((_INSERT_LISTING_SNAPSHOT_SQL, _listing_snapshot_params(rows)))
+
+	def insert_seller_snapshots_many(self, rows: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+		self._put((_INSERT_SELLER_SNAPSHOT_SQL, _seller_snapshot_params(rows)))
+
+	def write_page(self, summaries: Iterable[Tuple[str, Optional[str], Optional[str], Optional[str]]], listing_snapshots: Iterable[Tuple[str, Dict[str, Any]]], seller_snapshots: Iterable[Tuple[str, str, Dict[str, Any]]]) -> None:
+		"""Queue one search page's summaries and snapshots as a single batch: all of them are stored or none are."""
+		self._put(
+			(_UPSERT_LISTING_SQL, _summary_params(summaries)),
+			(_INSERT_LISTING_SNAPSHOT_SQL, _listing_snapshot_params(listing_snapshots)),
+			(_INSERT_SELLER_SNAPSHOT_SQL, _seller_snapshot_params(seller_snapshots)),
 		)
 
+	def close(self) -> None:
+		"""Flush queued writes and stop the writer; re-raises a write failure."""
+		self._queue.put(None)
+		self._thread.join()
+		if self._error is not None:
+			raise self._error
+
 
 def upsert_seller_summary(data: Dict[str, Any]) -> None:
 	"""Upsert seller summary data - placeholder function for compatibility."""
@@ -0,0 +1,83 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from unittest import mock
+
+# Modules import each other flat from the walmart/ directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("BLUECART_API_KEY", "test-key")
+
+import run_walmart
+from bluecart_client import BlueCartClient
+
+
+class _Response:
+	status_code = 200
+	headers: dict = {}
+
+	def __init__(self, params):
+		self.content = ('{"request_info": {"success": true}, "echo": "%s"}' % params.get("item_id", params.get("search_term", ""))).encode()
+
+	def json(self):
+		return json.loads(self.content)
+
+
+def _client(cache_max_size):
+	client = BlueCartClient(api_key="k", enable_rate_limit=False, enable_deduplication=False, cache_max_size=cache_max_size)
+	fetched = Counter()
+
+	def get(url, params=None, timeout=None):
+		fetched[(params["type"], params.get("item_id") or params.get("search_term"))] += 1
+		return _Response(params)
+
+	client.session.get = get
+	return client, fetched
+
+
+def _scan_two_keywords(client):
+	"""Keyword 1 finds product 111, then 1200 other calls happen, then keyword 2 finds 111 again."""
+	client.product("111")
+	for i in range(600):
+		client.search(f"kw-{i}")
+		client.product(f"other-{i}")
+	client.product("111")
+
+
+class ApiResponseCacheTest(unittest.TestCase):
+	def test_product_seen_under_two_keywords_is_fetched_once(self):
+		client, fetched = _client(run_walmart._API_CACHE_SIZE)
+		_scan_two_keywords(client)
+		self.assertEqual(fetched[("product", "111")], 1)
+
+	def test_old_default_size_evicts_it(self):
+		# Why run() no longer uses the client's default of 1000 entries
+		client, fetched = _client(1000)
+		_scan_two_keywords(client)
+		self.assertEqual(fetched[("product", "111")], 2)
+
+	def test_cache_size_flag_reaches_the_client(self):
+		class _Stop(Exception):
+			pass
+
+		created = {}
+
+		def fake_client(**kwargs):
+			created.update(kwargs)
+			raise _Stop
+
+		with tempfile.TemporaryDirectory() as tmp, \
+				mock.patch.dict(os.environ, {"DATABASE_PATH": os.path.join(tmp, "db.sqlite3"), "OUTPUT_DIR": tmp}), \
+				mock.patch.object(run_walmart, "BlueCartClient", side_effect=fake_client):
+			with self.assertRaises(_Stop):
+				run_walmart.main(["--keywords", "foo", "--cache-size", "1234"])
+			self.assertEqual(created["cache_max_size"], 1234)
+			with self.assertRaises(_Stop):
+				run_walmart.main(["--keywords", "foo"])
+			self.assertEqual(created["cache_max_size"], run_walmart._API_CACHE_SIZE)
+
+
+if __name__ == "__main__":
+	unittest.main()
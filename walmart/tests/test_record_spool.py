@@ -0,0 +1,57 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+# Modules import each other flat from the walmart/ directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("BLUECART_API_KEY", "test-key")
+
+import run_walmart
+from exporters import RecordSpool
+
+
+class _FailingClient:
+	site = "walmart.com"
+
+	def __init__(self, **kwargs):
+		pass
+
+	def search(self, *args, **kwargs):
+		raise RuntimeError("search failed")
+
+
+class RecordSpoolTest(unittest.TestCase):
+	def setUp(self):
+		tmp = tempfile.TemporaryDirectory()
+		self.addCleanup(tmp.cleanup)
+		self.output_dir = os.path.join(tmp.name, "output")
+		self.temp_dir = os.path.join(tmp.name, "tmp")
+		os.makedirs(self.temp_dir)
+		for patcher in (
+			mock.patch.dict(os.environ, {"OUTPUT_DIR": self.output_dir, "DATABASE_PATH": os.path.join(tmp.name, "db.sqlite3")}),
+			mock.patch.object(tempfile, "tempdir", self.temp_dir),
+		):
+			patcher.start()
+			self.addCleanup(patcher.stop)
+
+	def test_spool_lives_outside_the_output_dir(self):
+		spool = RecordSpool("walmart_records")
+		spool.append({"listing_id": "1"})
+		self.assertEqual(os.path.dirname(spool.path), self.temp_dir)
+		self.assertEqual(list(spool), [{"listing_id": "1"}])
+		spool.close()
+		self.assertEqual(os.listdir(self.temp_dir), [])
+
+	def test_failed_run_removes_its_spools(self):
+		with mock.patch.object(run_walmart, "BlueCartClient", _FailingClient):
+			with self.assertRaises(RuntimeError):
+				run_walmart.run(["foo"], 0, ["json"], 0.0, True, 1, False)
+		self.assertEqual(os.listdir(self.temp_dir), [])
+		left_in_output = os.listdir(self.output_dir) if os.path.isdir(self.output_dir) else []
+		self.assertEqual([f for f in left_in_output if f.endswith(".jsonl")], [])
+
+
+if __name__ == "__main__":
+	unittest.main()
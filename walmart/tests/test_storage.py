@@ -0,0 +1,64 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+# Modules import each other flat from the walmart/ directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("BLUECART_API_KEY", "test-key")
+
+import storage
+
+
+class StorageTest(unittest.TestCase):
+	def setUp(self):
+		tmp = tempfile.TemporaryDirectory()
+		self.addCleanup(tmp.cleanup)
+		self.db_path = os.path.join(tmp.name, "db.sqlite3")
+		env = mock.patch.dict(os.environ, {"DATABASE_PATH": self.db_path})
+		env.start()
+		self.addCleanup(env.stop)
+		storage.init_db()
+
+	def _rows(self, table):
+		conn = sqlite3.connect(self.db_path)
+		try:
+			return [r[0] for r in conn.execute(f"SELECT listing_id FROM {table} ORDER BY id")]
+		finally:
+			conn.close()
+
+	def test_failed_batch_stores_nothing(self):
+		with self.assertRaises(sqlite3.IntegrityError):
+			storage.insert_seller_snapshots_many([("a", "1", {}), ("b", "2", {}), ("c", None, {})])
+		self.assertEqual(self._rows("seller_history"), [])
+		storage.insert_seller_snapshots_many([("a", "1", {}), ("b", "2", {})])
+		self.assertEqual(self._rows("seller_history"), ["a", "b"])
+
+	def test_writer_drops_only_the_failed_page(self):
+		writer = storage.SnapshotWriter()
+		writer.write_page([("a", "A", None, None)], [("a", {})], [("a", "1", {})])
+		writer.write_page([("b", "B", None, None)], [("b", {})], [("b", "2", {}), ("c", None, {})])
+		with self.assertRaises(sqlite3.IntegrityError):
+			writer.close()
+		self.assertEqual(self._rows("listings"), ["a"])
+		self.assertEqual(self._rows("listing_history"), ["a"])
+		self.assertEqual(self._rows("seller_history"), ["a"])
+
+	def test_writer_failure_reaches_the_next_producer(self):
+		writer = storage.SnapshotWriter()
+		writer.write_page([], [], [("a", None, {})])
+		deadline = time.monotonic() + 5
+		with self.assertRaises(sqlite3.IntegrityError):
+			while time.monotonic() < deadline:
+				writer.insert_listing_snapshot("b", {})
+				time.sleep(0.01)
+		with self.assertRaises(sqlite3.IntegrityError):
+			writer.close()
+		self.assertEqual(self._rows("listing_history"), [])
+
+
+if __name__ == "__main__":
+	unittest.main()